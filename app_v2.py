@@ -10,19 +10,34 @@ from tkinter import ttk, filedialog, messagebox, scrolledtext
 import pandas as pd
 import numpy as np
 import re
+import sklearn
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize, MultiLabelBinarizer
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import io
 import os
+import sys
 import threading
+import queue
+import time
+import contextlib
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 import mysql.connector
 from mysql.connector import Error
 import json
+import urllib.request
+import urllib.error
 from datetime import datetime
 import pickle
+import joblib
 import hashlib
+import importlib.metadata
+import importlib.util
+from collections import Counter
+import itertools
+import operator
 
 # Try to import Sastrawi, provide fallback if not available
 try:
@@ -30,14 +45,325 @@ try:
     factory = StemmerFactory()
     stemmer = factory.create_stemmer()
     SASTRAWI_AVAILABLE = True
+    try:
+        SASTRAWI_VERSION = importlib.metadata.version('Sastrawi')
+    except importlib.metadata.PackageNotFoundError:
+        SASTRAWI_VERSION = 'unknown'
 except ImportError:
     SASTRAWI_AVAILABLE = False
     print("Warning: Sastrawi not available. Stemming will be skipped.")
 
+# Try to import pyarrow for fast CSV export and Parquet caches
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Try to import SimSIMD for SIMD cosine kernels on dense blocks
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    SIMSIMD_AVAILABLE = False
+
+# Try to import Numba for JIT-compiled numeric helpers
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# XlsxWriter streams Excel exports; pandas imports it by engine name, so only
+# check that it is installed
+XLSXWRITER_AVAILABLE = importlib.util.find_spec("xlsxwriter") is not None
+
+# Try to import zstandard for compressed preprocessing caches
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Try to import BLAKE3 for fast, multithreaded cache-key hashing
+try:
+    from blake3 import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# Preprocessing cache suffix; compressed and plain caches never collide
+CACHE_SUFFIX = '.pkl.zst' if ZSTD_AVAILABLE else '.pkl'
+
 LAPORAN_TRAINING_IDX = 21
 LAPORAN_JOB_IDX = 31
 
+# Match levels indexed by np.searchsorted(..., side='right') against the ascending thresholds
+LEVEL_NAMES = ("weak", "fair", "good", "very_good", "excellent")
+LEVEL_EMOJIS = ("🔴", "🟡", "🟡", "🟢", "🟢")
+MATCH_LEVELS = tuple(zip(LEVEL_NAMES, LEVEL_EMOJIS))
+# Level boundaries (fair, good, very_good, excellent) of the single-job view
+FIXED_LEVEL_BINS = np.array([0.35, 0.50, 0.65, 0.80])
+# Ascending boundaries and labels of the manual cosine similarity interpretation
+INTERPRETATION_THRESHOLDS = (0.50, 0.65, 0.80)
+SIMILARITY_INTERPRETATIONS = ("LOW - Poor match", "MEDIUM - Moderate match",
+                              "HIGH - Good match", "VERY HIGH - Excellent match!")
+
+def _corpus_analyzer(tokens):
+    """TF-IDF analyzer over already stemmed tokens; keeps the 2+ character
+    tokens the default token_pattern would have matched"""
+    return [t for t in tokens if len(t) > 1]
+
+def _new_content_hash():
+    """Hasher for cache keys: BLAKE3 when installed, otherwise BLAKE2b"""
+    if BLAKE3_AVAILABLE:
+        return blake3(max_threads=blake3.AUTO)
+    return hashlib.blake2b(digest_size=16)
+
+# Seconds to wait for the conditional GET that revalidates a remote workbook
+EXCEL_CHECK_TIMEOUT = 3
+# Seconds a remote workbook's Parquet copy is used without revalidating it
+EXCEL_REVALIDATE_SECONDS = 600
+
+def _read_parquet_copy(cache_file):
+    """Read a cached Parquet copy, or None if it is missing or unreadable"""
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        return pd.read_parquet(cache_file)
+    except Exception as e:
+        print(f"Parquet cache load error: {e}")
+        return None
+
+def _load_excel(source, cache_dir=None):
+    """Read an Excel file, reusing a Parquet copy while the source is unchanged
+    and falling back to that copy when a URL cannot be reached"""
+    if cache_dir is None or not PYARROW_AVAILABLE:
+        return pd.read_excel(source)
+    
+    # One Parquet copy per source, with the validators of the version it holds
+    # stored beside it. usecols is not passed: with openpyxl pandas still parses
+    # every cell and drops columns afterwards, so only the copy saves parse time
+    local = os.path.exists(source)
+    source_id = os.path.abspath(source) if local else source
+    digest = hashlib.blake2b(source_id.encode(), digest_size=16).hexdigest()
+    cache_file = os.path.join(cache_dir, f"excel_{digest}.parquet")
+    validator_file = cache_file + ".validator"
+    try:
+        with open(validator_file, encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = None
+    
+    if local:
+        st = os.stat(source)
+        validators = {'mtime_size': f"{st.st_mtime_ns}|{st.st_size}"}
+        if cached == validators:
+            df = _read_parquet_copy(cache_file)
+            if df is not None:
+                return df
+        df = pd.read_excel(source)
+    else:
+        # Checked recently: use the copy without touching the network
+        if (cached is not None
+                and time.time() - os.path.getmtime(validator_file) < EXCEL_REVALIDATE_SECONDS):
+            df = _read_parquet_copy(cache_file)
+            if df is not None:
+                return df
+        
+        # Conditional GET: 304 confirms the copy, 200 already carries the new workbook
+        request = urllib.request.Request(source)
+        if cached is not None and os.path.exists(cache_file):
+            if cached.get('etag'):
+                request.add_header('If-None-Match', cached['etag'])
+            if cached.get('last_modified'):
+                request.add_header('If-Modified-Since', cached['last_modified'])
+        try:
+            with urllib.request.urlopen(request, timeout=EXCEL_CHECK_TIMEOUT) as response:
+                data = response.read()
+                headers = response.headers
+        except urllib.error.HTTPError as e:
+            if e.code != 304:
+                raise
+            with contextlib.suppress(OSError):
+                os.utime(validator_file)
+            df = _read_parquet_copy(cache_file)
+            return df if df is not None else pd.read_excel(source)
+        except (urllib.error.URLError, OSError) as e:
+            # Best effort only: offline, the last copy is used as is
+            df = _read_parquet_copy(cache_file) if cached is not None else None
+            if df is None:
+                raise
+            print(f"Excel source check failed ({e}); using the cached copy")
+            return df
+        
+        df = pd.read_excel(io.BytesIO(data))
+        validators = {'etag': headers.get('ETag'), 'last_modified': headers.get('Last-Modified')}
+        if not any(validators.values()):
+            print(f"No ETag or Last-Modified for {source}; Parquet cache skipped")
+            return df
+    
+    try:
+        df.to_parquet(cache_file)
+        with open(validator_file, 'w', encoding='utf-8') as f:
+            json.dump(validators, f)
+    except Exception as e:
+        # Mixed-type columns cannot be stored; the workbook is simply re-parsed next time
+        print(f"Parquet cache save error: {e}")
+    return df
+
+def _cosine_fused(a, b):
+    """Dot product and both magnitudes in a single pass"""
+    d = 0.0
+    na = 0.0
+    nb = 0.0
+    for i in range(a.shape[0]):
+        x = a[i]
+        y = b[i]
+        d += x * y
+        na += x * x
+        nb += y * y
+    return d, np.sqrt(na), np.sqrt(nb)
+
+if NUMBA_AVAILABLE:
+    _cosine_fused = njit(cache=True, fastmath=True)(_cosine_fused)
+
+def _row_to_dict(mat, row, feats):
+    """Map the non-zero entries of one sparse row to {term: value}"""
+    r = mat.getrow(row)
+    return {feats[i]: float(v) for i, v in zip(r.indices, r.data)}
+
+# Below this many documents a worker pool costs more to start than it saves
+MIN_ROWS_FOR_PARALLEL = 10000
+
+# Rows sent per executemany call when bulk-saving to the database
+DB_BATCH_SIZE = 10000
+# Rows per multi-row VALUES insert, small enough for the default max_allowed_packet
+MULTI_INSERT_ROWS = 5000
+# Idle connections the background saver keeps open between saves
+DB_POOL_SIZE = 2
+# Hosts where protocol compression only costs CPU
+LOCAL_DB_HOSTS = ('localhost', '127.0.0.1', '::1')
+
+class _LazyConnectionPool:
+    """Connections for the DB worker thread: opened on first use, reused while
+    idle, and all closed by close()"""
+
+    def __init__(self, size, **config):
+        self._size = size
+        self._config = config
+        self._idle = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextlib.contextmanager
+    def get_connection(self):
+        """Borrow a connection for a with-block, opening one if none is idle"""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None or not conn.is_connected():
+            conn = mysql.connector.connect(**self._config)
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                keep = not self._closed and len(self._idle) < self._size
+                if keep:
+                    self._idle.append(conn)
+            if not keep:
+                conn.close()
+
+    def close(self):
+        """Close the idle connections; a borrowed one is closed when it is returned"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+# Export columns of the job-centric and training-centric recommendation views
+REC_COLUMNS = ('Job_Index', 'Job_Name', 'Company_Name', 'Rank', 'Training_Index',
+               'Training_Program', 'Similarity_Score', 'Similarity_Percentage',
+               'Status', 'Recommendation')
+TRAINING_REC_COLUMNS = ('Training_Index', 'Training_Program', 'Rank', 'Job_Index',
+                        'Job_Name', 'Company_Name', 'Similarity_Score',
+                        'Similarity_Percentage', 'Status', 'Recommendation')
+
+# Recommendation columns written to the recommendations table, in insert order
+_REC_GET = operator.itemgetter('Job_Index', 'Job_Name', 'Training_Index', 'Training_Program',
+                               'Rank', 'Similarity_Score', 'Similarity_Percentage', 'Status')
+
+# Text progress bar halves, sliced instead of rebuilt on every update
+PROGRESS_BAR_LENGTH = 50
+_FULL_BAR = '█' * PROGRESS_BAR_LENGTH
+_EMPTY_BAR = '░' * PROGRESS_BAR_LENGTH
+
+# Below this many rows pandas writes CSV faster than pyarrow can start up
+MIN_ROWS_FOR_ARROW_CSV = 50000
+
+# Token -> Sastrawi stem for this process; pool workers are seeded with it and
+# send their new stems back
+_stem_cache = {}
+
+def _stem_one(token):
+    """Stem a single token with Sastrawi, memoized per token"""
+    stem = _stem_cache.get(token)
+    if stem is None:
+        stem = sys.intern(stemmer.stem(token))
+        _stem_cache[token] = stem
+    return stem
+
+# Per-process state for the stemming workers
+_worker_rules = {}
+
+def _init_stem_worker(custom_stem_rules, stem_cache):
+    """Share the custom stem rules and the parent's stem cache with a worker
+    process (spawned workers start with an empty _stem_cache)"""
+    global _worker_rules
+    _worker_rules = custom_stem_rules
+    _stem_cache.update(stem_cache)
+
+def _worker(tokens):
+    """Stem one document's tokens in a worker process; also return the
+    (token, stem) pairs it added to the worker's cache, for the parent"""
+    if not SASTRAWI_AVAILABLE:
+        return list(tokens), []
+    stemmed = []
+    new_stems = []
+    for token in tokens:
+        # Apply custom rules first
+        if token in _worker_rules:
+            stemmed.append(_worker_rules[token])
+            continue
+        stem = _stem_cache.get(token)
+        if stem is None:
+            stem = _stem_one(token)
+            new_stems.append((token, stem))
+        stemmed.append(stem)
+    return stemmed, new_stems
+
 class BBPVPMatchingGUI:
+    # Normalization patterns, compiled once for every normalize_text call
+    _RE_PUNCT = re.compile(r'[^\w\s]')
+    _RE_DIGITS = re.compile(r'\d+')
+
+    # Same statement as sp_complete_experiment, without the CALL round-trips
+    _COMPLETE_EXPERIMENT_SQL = """
+    UPDATE experiments
+    SET status = %s, completed_at = CURRENT_TIMESTAMP
+    WHERE experiment_id = %s
+    """
+
+    # Recommendations INSERT head and one VALUES group, trimmed to keep packets small
+    _INSERT_SQL = ("INSERT INTO recommendations (experiment_id, job_index, job_name, "
+                   "training_index, training_name, rank_position, similarity_score, "
+                   "similarity_percentage, match_level) VALUES ")
+    _INSERT_ROW_SQL = "(%s,%s,%s,%s,%s,%s,%s,%s,%s)"
+
+    # Processed columns read back for each preprocessing sample
+    SAMPLE_COLUMNS = ['text_features', 'stemmed', 'token_count']
+
     def __init__(self, root):
         self.root = root
         self.root.title("BBPVP Job to Training Program Matching System")
@@ -67,11 +393,14 @@ class BBPVPMatchingGUI:
             'fair': 0.10
         }
 
+        self._pool = None
         self.db_connection = None
         self.current_experiment_id = None
+        self._last_status_text = None
         self.connect_to_database()
         self.cache_dir = "cache"
         os.makedirs(self.cache_dir, exist_ok=True)
+        self.load_stem_cache()
 
         self.progress_var = tk.DoubleVar()
         self.progress_label_var = tk.StringVar()
@@ -82,6 +411,32 @@ class BBPVPMatchingGUI:
         self.df_realisasi = None  
         self.current_step = 0
         self.total_saved_sample = 5
+        self._buffer = []
+        # Time of the last progress bar redraw per (widget, thread), for throttling
+        self._last_ui_tick = {}
+        # Widget updates posted by worker threads, applied by _pump_ui
+        self._ui_queue = queue.Queue()
+        
+        # Full-chunk multi-row recommendations INSERT text, built on first use
+        self._rec_insert_sql = None
+        # One worker keeps DB saves in submission order and off the Tk thread
+        self._db_executor = ThreadPoolExecutor(max_workers=1)
+        
+        # Compile the single-pair cosine kernel up front
+        if NUMBA_AVAILABLE:
+            _cosine_fused(np.zeros(2), np.zeros(2))
+        
+        # Corpus TF-IDF, fitted once after preprocessing
+        self._vec = None
+        self._X = None
+        self._X_train = None
+        self._X_jobs = None
+        # Similarity of the current fit; dropped whenever the fit is rebuilt
+        self._similarity = None
+        # Latest corpus fit as (key, (vectorizer, matrix)), plus the preprocessing
+        # cache keys of the current data, computed once per preprocessing run
+        self._tfidf_state = None
+        self._corpus_keys = {}
         
         # GitHub URLs 
         self.github_training_url = "https://github.com/allanbil214/bbpvp_tfidf/raw/refs/heads/main/data/programpelatihan.xlsx"
@@ -89,14 +444,14 @@ class BBPVPMatchingGUI:
         self.github_realisasi_url = "https://github.com/allanbil214/bbpvp_tfidf/raw/refs/heads/main/data/realisasipenempatan.xlsx"  
         
         # Indonesian stopwords
-        self.stopwords = {
+        self.stopwords = frozenset(map(sys.intern, {
             'dan', 'di', 'ke', 'dari', 'yang', 'untuk', 'pada', 'dengan',
             'dalam', 'adalah', 'ini', 'itu', 'atau', 'oleh', 'sebagai',
             'juga', 'akan', 'telah', 'dapat', 'ada', 'tidak', 'hal',
             'tersebut', 'serta', 'bagi', 'hanya', 'sangat', 'bila',
             'saat', 'kini', 'yaitu', 'dll', 'dsb', 'dst', 'setelah', 
             'mengikuti', 'sesuai', 'pelatihan'
-        }
+        }))
 
         self.custom_stem_rules = {
             'peserta': 'peserta',     
@@ -161,26 +516,36 @@ class BBPVPMatchingGUI:
             }
         }
         self.create_widgets()
+        self.root.after(50, self._pump_ui)
 
     def get_cache_key(self, df, dataset_type):
         """Generate cache key based on dataset content"""
-        # Create hash from dataset content
-        content = f"{dataset_type}_{len(df)}"
-        for idx in range(min(5, len(df))):  # Sample first 5 rows for hash
-            row = df.iloc[idx]
-            if dataset_type == 'pelatihan':
-                content += str(row.get('Deskripsi Tujuan Program Pelatihan/Kompetensi', ''))
-            else:
-                content += str(row.get('Deskripsi Pekerjaan', ''))
-        
-        return hashlib.md5(content.encode()).hexdigest()
+        # Hash every description plus the preprocessing settings, so any edit
+        # to the file, the stopwords or the stem rules misses the cache
+        if dataset_type == 'pelatihan':
+            column = 'Deskripsi Tujuan Program Pelatihan/Kompetensi'
+        else:
+            column = 'Deskripsi Pekerjaan'
+        
+        h = _new_content_hash()
+        h.update(f"{dataset_type}_{len(df)}".encode())
+        if column in df.columns:
+            h.update(df[column].fillna('').astype(str).str.cat(sep='\x1f').encode('utf-8'))
+        h.update(str(sorted(self.stopwords)).encode())
+        h.update(str(sorted(self.custom_stem_rules.items())).encode())
+        h.update(str(SASTRAWI_AVAILABLE).encode())
+        # 128-bit key from either hasher
+        return h.hexdigest()[:32]
     
     def load_from_cache(self, cache_key):
         """Load preprocessed data from cache"""
-        cache_file = os.path.join(self.cache_dir, f"{cache_key}.pkl")
+        cache_file = os.path.join(self.cache_dir, f"{cache_key}{CACHE_SUFFIX}")
         if os.path.exists(cache_file):
             try:
                 with open(cache_file, 'rb') as f:
+                    if ZSTD_AVAILABLE:
+                        with zstd.ZstdDecompressor().stream_reader(f) as reader:
+                            return pickle.load(reader)
                     return pickle.load(f)
             except Exception as e:
                 print(f"Cache load error: {e}")
@@ -189,15 +554,47 @@ class BBPVPMatchingGUI:
     
     def save_to_cache(self, cache_key, data):
         """Save preprocessed data to cache"""
-        cache_file = os.path.join(self.cache_dir, f"{cache_key}.pkl")
+        cache_file = os.path.join(self.cache_dir, f"{cache_key}{CACHE_SUFFIX}")
         try:
             with open(cache_file, 'wb') as f:
-                pickle.dump(data, f)
+                if ZSTD_AVAILABLE:
+                    # Token lists repeat a small vocabulary and compress well
+                    with zstd.ZstdCompressor(level=3).stream_writer(f) as writer:
+                        pickle.dump(data, writer, protocol=pickle.HIGHEST_PROTOCOL)
+                else:
+                    pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
             return True
         except Exception as e:
             print(f"Cache save error: {e}")
             return False
 
+    def get_stem_cache_file(self):
+        """Stem cache path, keyed by Sastrawi version so upgrades start fresh"""
+        return os.path.join(self.cache_dir, f"stem_cache_{SASTRAWI_VERSION}.pkl")
+
+    def load_stem_cache(self):
+        """Load persisted token stems into the module-level stem cache"""
+        if not SASTRAWI_AVAILABLE:
+            return
+        cache_file = self.get_stem_cache_file()
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'rb') as f:
+                    _stem_cache.update(pickle.load(f))
+                print(f"✓ Loaded {len(_stem_cache)} cached stems")
+            except Exception as e:
+                print(f"Stem cache load error: {e}")
+
+    def save_stem_cache(self):
+        """Persist the module-level stem cache to disk"""
+        if not SASTRAWI_AVAILABLE or not _stem_cache:
+            return
+        try:
+            with open(self.get_stem_cache_file(), 'wb') as f:
+                pickle.dump(_stem_cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"Stem cache save error: {e}")
+
     def show_progress_bar(self, parent_widget):
         """Show progress bar in the output widget"""
         self.progress_label_var.set("Processing...")
@@ -205,39 +602,98 @@ class BBPVPMatchingGUI:
         
     def update_progress(self, current, total, message, parent_widget):
         """Update progress bar on the same line"""
+        # Skip redraws within 50 ms of this bar's last one, except at 0.5% steps
+        # and the end. Ticks are per widget and thread, so concurrent bars
+        # cannot starve each other or race on a shared timestamp
+        now = time.monotonic()
+        tick_key = (str(parent_widget), threading.get_ident())
+        if (current < total and now - self._last_ui_tick.get(tick_key, 0.0) < 0.05
+                and current % max(1, total // 200)):
+            return
+        if current < total:
+            self._last_ui_tick[tick_key] = now
+        else:
+            # Finished bars drop their entry so thread ids do not pile up
+            self._last_ui_tick.pop(tick_key, None)
+        
         percentage = (current / total) * 100 if total > 0 else 0
         
         # Create a simple text-based progress bar
-        bar_length = 50
-        filled = int(bar_length * current / total) if total > 0 else 0
-        bar = '█' * filled + '░' * (bar_length - filled)
-        
-        # Get current content
-        content = parent_widget.get(1.0, tk.END)
-        # lines = content.rstrip('\n').split('\n')
-        
-        # # Check if last line is a progress bar (starts with '[')
-        # if lines and lines[-1].startswith('['):
-        #     # Remove the last line (old progress bar)
-        #     parent_widget.delete(f"{len(lines)}.0", tk.END)
-        
-        # Insert new progress bar
-        progress_line = f"[{bar}] {percentage:.1f}% - {message} ({current}/{total})\n"
-        parent_widget.insert(tk.END, progress_line)
-        parent_widget.see(tk.END)
+        filled = int(PROGRESS_BAR_LENGTH * current / total) if total > 0 else 0
+        
+        progress_line = (f"[{_FULL_BAR[:filled]}{_EMPTY_BAR[filled:]}] {percentage:.1f}% - "
+                         f"{message} ({current}/{total})\n")
+        if threading.current_thread() is not threading.main_thread():
+            self._ui_queue.put((self._draw_progress, (progress_line, parent_widget)))
+            return
+        self._draw_progress(progress_line, parent_widget)
         self.root.update()
+    
+    def _draw_progress(self, progress_line, parent_widget):
+        """Write the progress bar line, overwriting the previous one"""
+        # The "progress" mark sits at the start of the bar line. If that line is
+        # still the last one, overwrite it; otherwise start a new bar at the end
+        tail = ''
+        if 'progress' in parent_widget.mark_names():
+            tail = parent_widget.get('progress', 'end-1c')
+        if tail.startswith('[') and tail.count('\n') == 1:
+            parent_widget.delete('progress', 'end-1c')
+        else:
+            parent_widget.mark_set('progress', 'end-1c')
+            parent_widget.mark_gravity('progress', tk.LEFT)
+        
+        parent_widget.insert('progress', progress_line)
+        parent_widget.see(tk.END)
+    
+    def _pump_ui(self):
+        """Apply widget updates queued by worker threads, then reschedule"""
+        try:
+            for _ in range(64):
+                try:
+                    func, args = self._ui_queue.get_nowait()
+                except queue.Empty:
+                    break
+                func(*args)
+        finally:
+            self.root.after(50, self._pump_ui)
 
     def create_widgets(self):
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill='both', expand=True, padx=5, pady=5)
 
+        # Tabs are added empty; each is built when first selected, and the rest
+        # are filled in one per idle pass so the window shows up right away
+        self._tab_builders = {}
         for cfg in self.tabs_config.values():
             if not cfg["visible"]:
                 continue
 
             frame = ttk.Frame(self.notebook)
             self.notebook.add(frame, text=cfg["title"])
-            cfg["builder"](frame)
+            self._tab_builders[str(frame)] = (cfg["builder"], frame)
+        
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        if self._tab_builders:
+            self.build_tab(self.notebook.select())
+            self.root.after_idle(self._build_pending_tab)
+    
+    def build_tab(self, tab_id):
+        """Build a tab's contents the first time it is needed"""
+        entry = self._tab_builders.pop(str(tab_id), None)
+        if entry is not None:
+            builder, frame = entry
+            builder(frame)
+    
+    def _on_tab_changed(self, event):
+        """Build the newly selected tab if it is still empty"""
+        self.build_tab(self.notebook.select())
+    
+    def _build_pending_tab(self):
+        """Build the next unbuilt tab, then yield to the event loop"""
+        if self._tab_builders:
+            self.build_tab(next(iter(self._tab_builders)))
+        if self._tab_builders:
+            self.root.after_idle(self._build_pending_tab)
         
     def create_database_tab(self, parent):
         """Create database configuration tab"""
@@ -364,6 +820,7 @@ class BBPVPMatchingGUI:
         self.db_status_detail = tk.Text(status_frame, height=4, wrap=tk.WORD, 
                                         font=('Arial', 9), state='disabled')
         self.db_status_detail.pack(fill='x', pady=5)
+        self._last_status_text = None
         
         # Connection logs
         logs_frame = ttk.LabelFrame(right_frame, text="Connection Logs", padding="5")
@@ -1124,19 +1581,19 @@ class BBPVPMatchingGUI:
         def analyze():
             try:
                 from sklearn.feature_extraction.text import TfidfVectorizer
-                from sklearn.metrics.pairwise import cosine_similarity
                 
                 # Step 1: Preprocess realisasi program names
                 self.log_message("📝 Step 1/3: Preprocessing realisasi program names...", self.analysis_output)
                 df_real_copy = self.df_realisasi.copy()
                 
                 # Preprocess realisasi
-                df_real_copy['text_features'] = df_real_copy['Program Pelatihan'].fillna('')
-                df_real_copy['normalized'] = df_real_copy['text_features'].apply(self.normalize_text)
-                df_real_copy['no_stopwords'] = df_real_copy['normalized'].apply(self.remove_stopwords)
-                df_real_copy['tokens'] = df_real_copy['no_stopwords'].apply(self.tokenize_text)
-                df_real_copy['stemmed_tokens'] = df_real_copy['tokens'].apply(self.stem_tokens)
-                df_real_copy['preprocessed_text'] = df_real_copy['stemmed_tokens'].apply(lambda x: ' '.join(x))
+                df_real_copy['text_features'] = df_real_copy['Program Pelatihan'].fillna('').astype(str)
+                # All stages in one pass per name; only the joined stems are used below
+                df_real_copy['preprocessed_text'] = [
+                    ' '.join(self.stem_tokens(self.tokenize_text(
+                        self.remove_stopwords(self.normalize_text(text)))))
+                    for text in df_real_copy['text_features'].values
+                ]
                 
                 self.log_message(f"   ✓ Preprocessed {len(df_real_copy)} realisasi programs\n", self.analysis_output)
                 
@@ -1147,15 +1604,16 @@ class BBPVPMatchingGUI:
                 # Calculate similarity between realisasi and training programs
                 all_texts = list(df_real_copy['preprocessed_text']) + list(self.df_pelatihan['preprocessed_text'])
                 
-                vectorizer = TfidfVectorizer()
+                vectorizer = TfidfVectorizer(dtype=np.float32)
                 tfidf_matrix = vectorizer.fit_transform(all_texts)
                 
                 n_realisasi = len(df_real_copy)
                 realisasi_vectors = tfidf_matrix[:n_realisasi]
                 training_vectors = tfidf_matrix[n_realisasi:]
                 
-                # Calculate similarity matrix: realisasi x training
-                realisasi_to_training_sim = cosine_similarity(realisasi_vectors, training_vectors)
+                # Calculate similarity matrix: realisasi x training. Rows are already
+                # L2-normalized, so cosine similarity is a single sparse product
+                realisasi_to_training_sim = (realisasi_vectors @ training_vectors.T).toarray()
                 
                 self.log_message(f"   ✓ Calculated realisasi-to-training similarities\n", self.analysis_output)
                 
@@ -1188,18 +1646,26 @@ class BBPVPMatchingGUI:
                     self.analysis_output
                 )
                 
-                for real_idx, real_row in df_real_copy.iterrows():
-                    program_name = real_row['Program Pelatihan']
-                    
+                # Job columns read for every matched program
+                job_names = self.df_lowongan['Nama Jabatan (Sumber Perusahaan)'].to_numpy()
+                if 'Perkiraan Lowongan' in self.df_lowongan.columns:
+                    job_vacancies = self.df_lowongan['Perkiraan Lowongan'].to_numpy().astype(np.int64)
+                else:
+                    job_vacancies = np.ones(len(self.df_lowongan), dtype=np.int64)
+                
+                # Plain tuples of the four columns used, not a Series per row
+                realisasi_rows = df_real_copy[['Program Pelatihan', 'Jumlah Peserta',
+                                               'Penempatan', '% Penempatan']].itertuples(name=None)
+                for real_idx, program_name, graduates, placed, placement_rate in realisasi_rows:
                     # Skip NaN program names (like the TOTAL row)
                     if pd.isna(program_name):
                         continue
                     
-                    graduates = int(real_row['Jumlah Peserta'])
-                    placed = int(real_row['Penempatan'])
+                    graduates = int(graduates)
+                    placed = int(placed)
                     
                     # Parse placement rate correctly
-                    placement_rate_str = str(real_row['% Penempatan'])
+                    placement_rate_str = str(placement_rate)
                     if '%' in placement_rate_str:
                         # Already in percentage format (e.g., "50.00%")
                         placement_rate = float(placement_rate_str.replace('%', '').strip())
@@ -1250,27 +1716,16 @@ class BBPVPMatchingGUI:
                         })
                         continue
                     
-                    # Find matching jobs (above threshold)
-                    matching_job_indices = [i for i, sim in enumerate(job_similarities) 
-                                        if sim >= job_threshold]
-                    
-                    # Calculate total vacancies and get job details
-                    total_vacancies = 0
-                    top_jobs = []
-                    
-                    for job_idx in matching_job_indices:
-                        job_row = self.df_lowongan.iloc[job_idx]
-                        vacancy_count = int(job_row.get('Perkiraan Lowongan', 1))
-                        total_vacancies += vacancy_count
-                        
-                        top_jobs.append({
-                            'job_name': job_row['Nama Jabatan (Sumber Perusahaan)'],
-                            'similarity': round(float(job_similarities[job_idx]) * 100, 2),
-                            'vacancies': vacancy_count
-                        })
-                    
-                    # Sort jobs by similarity
-                    top_jobs.sort(key=lambda x: x['similarity'], reverse=True)
+                    # Find matching jobs (above threshold); vacancies count every
+                    # match, but only the best 10 are ranked and kept
+                    top_job_indices, n_matching = self.top_n_indices(job_similarities,
+                                                                     job_threshold, 10)
+                    total_vacancies = int(job_vacancies[job_similarities >= job_threshold].sum())
+                    top_jobs = [{
+                        'job_name': job_names[job_idx],
+                        'similarity': round(float(job_similarities[job_idx]) * 100, 2),
+                        'vacancies': int(job_vacancies[job_idx])
+                    } for job_idx in top_job_indices]
                     
                     # Calculate metrics
                     market_capacity = (total_vacancies / graduates * 100) if graduates > 0 else 0.0
@@ -1290,7 +1745,7 @@ class BBPVPMatchingGUI:
                     
                     prog_display = program_name[:41] + ".." if len(program_name) > 43 else program_name
                     self.log_message(
-                        f"│ {prog_display:<43} │ {graduates:>10} │ {placed:>10} │ {placement_rate:>9.1f}% │ {len(matching_job_indices):>10} │ {market_capacity:>9.1f}% │ {status[:8]:<8} │",
+                        f"│ {prog_display:<43} │ {graduates:>10} │ {placed:>10} │ {placement_rate:>9.1f}% │ {n_matching:>10} │ {market_capacity:>9.1f}% │ {status[:8]:<8} │",
                         self.analysis_output
                     )
                     
@@ -1301,16 +1756,16 @@ class BBPVPMatchingGUI:
                         'graduates': graduates,
                         'placed': placed,
                         'placement_rate': placement_rate,
-                        'matching_jobs': len(matching_job_indices),
+                        'matching_jobs': n_matching,
                         'total_vacancies': total_vacancies,
                         'market_capacity': round(market_capacity, 2),
                         'gap': round(gap, 2),
                         'status': status,
-                        'top_jobs': top_jobs[:10]  # Top 10 jobs
+                        'top_jobs': top_jobs  # Top 10 jobs
                     })
                     
                     # Store job details for export
-                    for job in top_jobs[:10]:
+                    for job in top_jobs:
                         job_details_list.append({
                             'program_name': program_name,
                             'status': status,
@@ -1584,8 +2039,8 @@ class BBPVPMatchingGUI:
             
             # Load job options
             if self.df_lowongan is not None:
-                job_options = [f"{i}: {row['Nama Jabatan (Sumber Perusahaan)']}" 
-                            for i, row in self.df_lowongan.iterrows()]
+                job_options = [f"{i}: {name}" 
+                            for i, name in self.df_lowongan['Nama Jabatan (Sumber Perusahaan)'].items()]
                 self.rec_job_combo['values'] = job_options
                 if job_options:
                     self.rec_job_combo.current(0)
@@ -1625,8 +2080,8 @@ class BBPVPMatchingGUI:
             
             # Load training options
             if self.df_pelatihan is not None:
-                training_options = [f"{i}: {row['PROGRAM PELATIHAN']}" 
-                            for i, row in self.df_pelatihan.iterrows()]
+                training_options = [f"{i}: {name}" 
+                            for i, name in self.df_pelatihan['PROGRAM PELATIHAN'].items()]
                 self.rec_training_combo['values'] = training_options
                 if training_options:
                     self.rec_training_combo.current(0)
@@ -1984,14 +2439,43 @@ class BBPVPMatchingGUI:
         """Log message to specified widget or import_status"""
         if widget is None:
             widget = self.import_status
+        if threading.current_thread() is not threading.main_thread():
+            # Tk is not thread-safe; the main loop writes it in _pump_ui
+            self._ui_queue.put((self._write_log, (message, widget)))
+            return
+        self._write_log(message, widget)
+        self.root.update()
+    
+    def _write_log(self, message, widget):
+        """Append a log line to the widget"""
         widget.insert(tk.END, message + "\n")
         widget.see(tk.END)
-        self.root.update()
+    
+    def _log_buf(self, message):
+        """Queue a log line for the next flush"""
+        self._buffer.append(message)
+    
+    def _flush_log_buf(self, widget=None):
+        """Write all queued log lines with a single insert"""
+        if widget is None:
+            widget = self.import_status
+        if self._buffer:
+            widget.insert(tk.END, "\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        widget.see(tk.END)
+        self.root.update_idletasks()
     
     def connect_to_database(self):
         """Connect to MySQL database"""
         try:
-            self.db_connection = mysql.connector.connect(**self.db_config)
+            # C extension when installed: binding and protocol framing run in C.
+            # Bulk inserts repeat the same names, so compress them on remote links
+            compress = self.db_config['host'] not in LOCAL_DB_HOSTS
+            config = dict(self.db_config, use_pure=False, compress=compress)
+            self.db_connection = mysql.connector.connect(**config)
+            # Saves run on the DB worker with their own connections, opened on
+            # first use so only the ones actually needed are ever connected
+            self._pool = _LazyConnectionPool(DB_POOL_SIZE, **config)
             
             if self.db_connection.is_connected():
                 print("✓ Connected to MySQL database")
@@ -2005,8 +2489,19 @@ class BBPVPMatchingGUI:
             print(f"✗ Database connection error: {e}")
             if hasattr(self, 'db_log_output'):
                 self.log_message(f"✗ Database connection error: {e}\n", self.db_log_output)
+            self._pool = None
             self.db_connection = None
 
+    def close_database(self):
+        """Close the UI connection and every idle pooled connection; one still
+        held by a save is closed when that save returns it"""
+        if self._pool is not None:
+            self._pool.close()
+        if self.db_connection is not None and self.db_connection.is_connected():
+            self.db_connection.close()
+        self.db_connection = None
+        self._pool = None
+
     def save_db_config(self):
         """Save database configuration"""
         try:
@@ -2094,9 +2589,10 @@ class BBPVPMatchingGUI:
         self.log_message("RECONNECTING TO DATABASE", self.db_log_output)
         self.log_message("=" * 80 + "\n", self.db_log_output)
         
-        # Close existing connection
-        if self.db_connection and self.db_connection.is_connected():
-            self.db_connection.close()
+        # Close existing connections; the pool is rebuilt with the new settings.
+        # Queued saves hold the old pool and finish on it, so nothing waits here
+        if self._pool is not None:
+            self.close_database()
             self.log_message("✓ Closed existing connection", self.db_log_output)
         
         # Save configuration
@@ -2150,10 +2646,15 @@ class BBPVPMatchingGUI:
                 f"click 'Test Connection' or 'Reconnect'"
             )
         
+        # Skip the widget rewrite when nothing changed
+        if status_text == self._last_status_text:
+            return
+        
         self.db_status_detail.config(state='normal')
         self.db_status_detail.delete(1.0, tk.END)
         self.db_status_detail.insert(1.0, status_text)
         self.db_status_detail.config(state='disabled')
+        self._last_status_text = status_text
 
     def load_both_data(self):
         """Load both training and job data at once"""
@@ -2164,17 +2665,42 @@ class BBPVPMatchingGUI:
             return
         
         self.import_status.delete(1.0, tk.END)
+        # New documents: the corpus TF-IDF keys must be recomputed
+        self._corpus_keys = {}
         self.log_message("=" * 80)
         self.log_message("LOADING ALL DATASETS FROM GITHUB")
         self.log_message("=" * 80)
         
         def load():
+            try:
+                # Fetch all three workbooks in parallel; the downloads dominate.
+                # Threads, not processes: a frozen exe would reopen the GUI per worker
+                self.root.after(0, self.log_message,
+                                "\n⏳ Downloading and parsing 3 datasets in parallel...", self.import_status)
+                with ThreadPoolExecutor(max_workers=3) as executor:
+                    training_future = executor.submit(_load_excel, self.github_training_url, self.cache_dir)
+                    jobs_future = executor.submit(_load_excel, self.github_jobs_url, self.cache_dir)
+                    realisasi_future = executor.submit(_load_excel, self.github_realisasi_url, self.cache_dir)
+                    df_pelatihan = training_future.result()
+                    df_lowongan = jobs_future.result()
+                    df_realisasi = realisasi_future.result()
+            except Exception as e:
+                self.root.after(0, load_failed, e)
+                return
+            
+            self.root.after(0, load_finished, df_pelatihan, df_lowongan, df_realisasi)
+        
+        def load_failed(e):
+            self.log_message(f"\n✗ Error: {str(e)}", self.import_status)
+            messagebox.showerror("Error", f"Failed to load data:\n{str(e)}")
+        
+        def load_finished(df_pelatihan, df_lowongan, df_realisasi):
             try:
                 # Load Training Data
                 self.log_message("\n[1/3] Loading Training Data (Pelatihan)...", self.import_status)
                 self.update_progress(1, 3, "Loading training data", self.import_status)
                 self.log_message(f"URL: {self.github_training_url}", self.import_status)
-                self.df_pelatihan = pd.read_excel(self.github_training_url)
+                self.df_pelatihan = df_pelatihan
                 self.log_message(f"✓ Training Data loaded: {self.df_pelatihan.shape[0]} rows, "
                             f"{self.df_pelatihan.shape[1]} columns", self.import_status)
                 
@@ -2185,7 +2711,7 @@ class BBPVPMatchingGUI:
                 self.log_message("\n[2/3] Loading Job Data (Lowongan)...", self.import_status)
                 self.update_progress(2, 3, "Loading job data", self.import_status)
                 self.log_message(f"URL: {self.github_jobs_url}", self.import_status)
-                self.df_lowongan = pd.read_excel(self.github_jobs_url)
+                self.df_lowongan = df_lowongan
                 self.log_message(f"✓ Job Data loaded: {self.df_lowongan.shape[0]} rows, "
                             f"{self.df_lowongan.shape[1]} columns", self.import_status)
                 
@@ -2198,7 +2724,7 @@ class BBPVPMatchingGUI:
                 self.log_message("\n[3/3] Loading Realisasi Penempatan...", self.import_status)
                 self.update_progress(3, 3, "Loading placement data", self.import_status)
                 self.log_message(f"URL: {self.github_realisasi_url}", self.import_status)
-                self.df_realisasi = pd.read_excel(self.github_realisasi_url)
+                self.df_realisasi = df_realisasi
                 self.log_message(f"✓ Realisasi Data loaded: {self.df_realisasi.shape[0]} rows, "
                             f"{self.df_realisasi.shape[1]} columns", self.import_status)
                 
@@ -2244,13 +2770,15 @@ class BBPVPMatchingGUI:
 
     def load_training_data(self):
         self.import_status.delete(1.0, tk.END)
+        # New documents: the corpus TF-IDF keys must be recomputed
+        self._corpus_keys = {}
         self.log_message("Loading Training Data (Pelatihan)...")
         
         def load():
             try:
                 if self.data_source_var.get() == "github":
                     self.log_message(f"Fetching from GitHub...")
-                    self.df_pelatihan = pd.read_excel(self.github_training_url) #, 
+                    self.df_pelatihan = _load_excel(self.github_training_url, self.cache_dir) #, 
                                                      # sheet_name="Versi Ringkas Untuk Tesis")
                 else:
                     filename = filedialog.askopenfilename(
@@ -2259,7 +2787,7 @@ class BBPVPMatchingGUI:
                     )
                     if filename:
                         self.log_message(f"Loading from: {filename}")
-                        self.df_pelatihan = pd.read_excel(filename) #, 
+                        self.df_pelatihan = _load_excel(filename, self.cache_dir) #, 
                                                          # sheet_name="Versi Ringkas Untuk Tesis")
                     else:
                         self.log_message("No file selected.")
@@ -2281,13 +2809,15 @@ class BBPVPMatchingGUI:
     
     def load_job_data(self):
         self.import_status.delete(1.0, tk.END)
+        # New documents: the corpus TF-IDF keys must be recomputed
+        self._corpus_keys = {}
         self.log_message("Loading Job Data (Lowongan)...")
         
         def load():
             try:
                 if self.data_source_var.get() == "github":
                     self.log_message(f"Fetching from GitHub...")
-                    self.df_lowongan = pd.read_excel(self.github_jobs_url) #, 
+                    self.df_lowongan = _load_excel(self.github_jobs_url, self.cache_dir) #, 
                                                     # sheet_name="petakan ke KBJI")
                 else:
                     filename = filedialog.askopenfilename(
@@ -2296,7 +2826,7 @@ class BBPVPMatchingGUI:
                     )
                     if filename:
                         self.log_message(f"Loading from: {filename}")
-                        self.df_lowongan = pd.read_excel(filename) #, 
+                        self.df_lowongan = _load_excel(filename, self.cache_dir) #, 
                                                         # sheet_name="petakan ke KBJI")
                     else:
                         self.log_message("No file selected.")
@@ -2322,7 +2852,7 @@ class BBPVPMatchingGUI:
             try:
                 if self.data_source_var.get() == "github":
                     self.log_message(f"Fetching from GitHub...")
-                    self.df_realisasi = pd.read_excel(self.github_realisasi_url)
+                    self.df_realisasi = _load_excel(self.github_realisasi_url, self.cache_dir)
                 else:
                     filename = filedialog.askopenfilename(
                         title="Select Realisasi Penempatan File",
@@ -2330,7 +2860,7 @@ class BBPVPMatchingGUI:
                     )
                     if filename:
                         self.log_message(f"Loading from: {filename}")
-                        self.df_realisasi = pd.read_excel(filename)
+                        self.df_realisasi = _load_excel(filename, self.cache_dir)
                     else:
                         self.log_message("No file selected.")
                         return
@@ -2652,54 +3182,73 @@ class BBPVPMatchingGUI:
 
     def normalize_text(self, text):
         """Normalize text: lowercase, remove punctuation and numbers"""
-        if pd.isna(text):
-            return ""
-        text = str(text).lower()
+        # Callers pass strings; missing values are filled with '' up front
+        text = text.lower()
         # text = self.expand_synonyms(text)
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\d+', '', text)
+        text = self._RE_PUNCT.sub(' ', text)
+        text = self._RE_DIGITS.sub('', text)
         text = ' '.join(text.split())
         return text
     
     def remove_stopwords(self, text):
         """Remove Indonesian stopwords"""
-        if not text:
-            return ""
-        words = text.split()
-        filtered_words = [w for w in words if w not in self.stopwords]
-        return ' '.join(filtered_words)
+        stopwords = self.stopwords
+        return ' '.join(w for w in text.split() if w not in stopwords)
     
     def tokenize_text(self, text):
         """Tokenize text into words"""
-        if not text:
-            return []
-        return text.split()
+        # Interned so repeated words share one string object
+        return list(map(sys.intern, text.split()))
     
     def stem_text(self, text):
         """Stem text using Sastrawi (applied on whole text for backward compatibility)"""
-        if not text:
-            return ""
         if SASTRAWI_AVAILABLE:
             return stemmer.stem(text)
         else:
             return text  # Return original if Sastrawi not available
     
+    def _preprocess_series(self, texts):
+        """Normalize, remove stopwords and tokenize a Series of texts in one pass"""
+        # Same steps as normalize_text/remove_stopwords/tokenize_text, but the
+        # regex passes run column-wise instead of once per row
+        tokens = (texts.str.lower()
+                  .str.replace(self._RE_PUNCT, ' ', regex=True)
+                  .str.replace(self._RE_DIGITS, '', regex=True)
+                  .str.split())
+        stopwords = self.stopwords
+        intern = sys.intern
+        return [[intern(t) for t in toks if t not in stopwords] for toks in tokens]
+    
     def stem_tokens(self, tokens):
         """Stem each token individually using Sastrawi with custom rules"""
         if not tokens:
             return []
         if SASTRAWI_AVAILABLE:
-            stemmed = []
-            for token in tokens:
-                # Apply custom rules first
-                if token in self.custom_stem_rules:
-                    stemmed.append(self.custom_stem_rules[token])
-                else:
-                    stemmed.append(stemmer.stem(token))
-            return stemmed
+            rules = self.custom_stem_rules
+            # Apply custom rules first
+            return [rules[t] if t in rules else _stem_one(t) for t in tokens]
         else:
             return tokens
     
+    def iter_stemmed_documents(self, token_lists):
+        """Yield stemmed token lists in order, using a worker pool for large inputs"""
+        if len(token_lists) < MIN_ROWS_FOR_PARALLEL:
+            for tokens in token_lists:
+                yield self.stem_tokens(tokens)
+            return
+        
+        workers = os.cpu_count() or 1
+        chunksize = max(1, len(token_lists) // (workers * 4))
+        intern = sys.intern
+        with multiprocessing.Pool(workers, initializer=_init_stem_worker,
+                                  initargs=(self.custom_stem_rules, _stem_cache)) as pool:
+            for stemmed, new_stems in pool.imap(_worker, token_lists, chunksize=chunksize):
+                # Unpickled strings are new objects: re-intern them, and merge the
+                # workers' new stems so save_stem_cache persists them
+                for token, stem in new_stems:
+                    _stem_cache[intern(token)] = intern(stem)
+                yield [intern(t) for t in stemmed]
+    
     def load_document_options(self):
         """Load available documents into comboboxes"""
         if self.df_pelatihan is None or self.df_lowongan is None:
@@ -2715,15 +3264,15 @@ class BBPVPMatchingGUI:
             return
         
         # Load pelatihan options
-        pelatihan_options = [f"{i}: {row['PROGRAM PELATIHAN']}" 
-                            for i, row in self.df_pelatihan.iterrows()]
+        pel_names = self.df_pelatihan['PROGRAM PELATIHAN'].tolist()
+        pelatihan_options = [f"{i}: {name}" for i, name in enumerate(pel_names)]
         self.pelatihan_combo['values'] = pelatihan_options
         if pelatihan_options:
             self.pelatihan_combo.current(0)
         
         # Load lowongan options
-        lowongan_options = [f"{i}: {row['Nama Jabatan (Sumber Perusahaan)']}" 
-                           for i, row in self.df_lowongan.iterrows()]
+        low_names = self.df_lowongan['Nama Jabatan (Sumber Perusahaan)'].tolist()
+        lowongan_options = [f"{i}: {name}" for i, name in enumerate(low_names)]
         self.lowongan_combo['values'] = lowongan_options
         if lowongan_options:
             self.lowongan_combo.current(0)
@@ -2769,7 +3318,7 @@ class BBPVPMatchingGUI:
         self.log_message(f"Total tokens: {len(tokens2)}", self.tfidf_output)
         
         # Get all unique terms
-        all_terms = sorted(set(tokens1 + tokens2))
+        all_terms = sorted(set(tokens1).union(tokens2))
         self.log_message(f"\n📊 Unique terms across both documents: {len(all_terms)}", self.tfidf_output)
         self.log_message(f"Terms: {all_terms}", self.tfidf_output)
         
@@ -2804,9 +3353,10 @@ class BBPVPMatchingGUI:
         self.log_message(f"\n📄 D1: {doc1_name}", self.tfidf_output)
         self.log_message(f"Total tokens in D1: {len(tokens1)}", self.tfidf_output)
         
+        counts1 = Counter(tokens1)
         tf_d1 = {}
         for term in self.current_all_terms:
-            count = tokens1.count(term)
+            count = counts1.get(term, 0)
             tf = count / len(tokens1) if len(tokens1) > 0 else 0
             tf_d1[term] = {'count': count, 'tf': tf}
         
@@ -2826,9 +3376,10 @@ class BBPVPMatchingGUI:
         self.log_message(f"\n📄 D2: {doc2_name}", self.tfidf_output)
         self.log_message(f"Total tokens in D2: {len(tokens2)}", self.tfidf_output)
         
+        counts2 = Counter(tokens2)
         tf_d2 = {}
         for term in self.current_all_terms:
-            count = tokens2.count(term)
+            count = counts2.get(term, 0)
             tf = count / len(tokens2) if len(tokens2) > 0 else 0
             tf_d2[term] = {'count': count, 'tf': tf}
         
@@ -2912,29 +3463,33 @@ class BBPVPMatchingGUI:
         self.log_message("where N = total documents = 2", self.tfidf_output)
         
         N = 2  # Total documents
-        idf_dict = {}
+        terms = self.current_all_terms
+        df_arr = np.fromiter((self.df_dict[t] for t in terms), dtype=np.float64, count=len(terms))
+        
+        if use_smoothing:
+            # Smoothed formula
+            idf_arr = np.log((N + 1) / (df_arr + 1)) + 1
+        else:
+            # Non-smoothed formula (for laporan)
+            idf_arr = np.zeros_like(df_arr)
+            present = df_arr > 0
+            idf_arr[present] = np.log(N / df_arr[present])
+        
+        idf_dict = dict(zip(terms, idf_arr.tolist()))
         
         self.log_message(f"\n{'Term':<20} {'DF':<10} {'IDF Calculation':<30} {'IDF':<10}", 
                         self.tfidf_output)
         self.log_message("-" * 70, self.tfidf_output)
         
-        for term in self.current_all_terms:
+        for term, idf in zip(terms, idf_arr.tolist()):
             df = self.df_dict[term]
             
             if use_smoothing:
-                # Smoothed formula
-                idf = np.log((N + 1) / (df + 1)) + 1
                 calc_str = f"log(({N}+1)/({df}+1))+1"
+            elif df > 0:
+                calc_str = f"log({N}/{df})"
             else:
-                # Non-smoothed formula (for laporan)
-                if df > 0:
-                    idf = np.log(N / df)
-                    calc_str = f"log({N}/{df})"
-                else:
-                    idf = 0
-                    calc_str = "0"
-            
-            idf_dict[term] = idf
+                calc_str = "0"
             
             self.log_message(f"{term:<20} {df:<10} {calc_str:<30} {idf:.4f}", 
                         self.tfidf_output)
@@ -2946,6 +3501,8 @@ class BBPVPMatchingGUI:
                         self.tfidf_output)
                 
         self.idf_dict = idf_dict
+        self.idf_arr = idf_arr
+        self.term_to_idx = {t: i for i, t in enumerate(terms)}
 
     def calculate_tfidf(self):
         """Step 5: Calculate TF-IDF"""
@@ -2965,49 +3522,43 @@ class BBPVPMatchingGUI:
         
         self.log_message("\nFormula: TF-IDF(t,d) = TF(t,d) × IDF(t)", self.tfidf_output)
         
+        # Aligned vectors: position i holds the value for current_all_terms[i]
+        terms = self.current_all_terms
+        idf_arr = self.idf_arr
+        tf1_arr = np.fromiter((self.tf_d1[t]['tf'] for t in terms), dtype=np.float64, count=len(terms))
+        tf2_arr = np.fromiter((self.tf_d2[t]['tf'] for t in terms), dtype=np.float64, count=len(terms))
+        
+        tfidf_d1 = tf1_arr * idf_arr
+        tfidf_d2 = tf2_arr * idf_arr
+        
         # Calculate TF-IDF for D1
-        tfidf_d1 = {}
         self.log_message(f"\n📄 D1: {doc1_name}", self.tfidf_output)
         self.log_message(f"{'Term':<20} {'TF':<15} {'IDF':<15} {'TF-IDF':<15}", 
                         self.tfidf_output)
         self.log_message("-" * 65, self.tfidf_output)
         
-        for term in self.current_all_terms:
-            tf = self.tf_d1[term]['tf']
-            idf = self.idf_dict[term]
-            tfidf = tf * idf
-            tfidf_d1[term] = tfidf
-            
+        for term, tf, idf, tfidf in zip(terms, tf1_arr.tolist(), idf_arr.tolist(), tfidf_d1.tolist()):
             self.log_message(f"{term:<20} {tf:<15.4f} {idf:<15.4f} {tfidf:<15.4f}", 
                            self.tfidf_output)
         
         # Calculate TF-IDF for D2
-        tfidf_d2 = {}
         self.log_message(f"\n📄 D2: {doc2_name}", self.tfidf_output)
         self.log_message(f"{'Term':<20} {'TF':<15} {'IDF':<15} {'TF-IDF':<15}", 
                         self.tfidf_output)
         self.log_message("-" * 65, self.tfidf_output)
         
-        for term in self.current_all_terms:
-            tf = self.tf_d2[term]['tf']
-            idf = self.idf_dict[term]
-            tfidf = tf * idf
-            tfidf_d2[term] = tfidf
-            
+        for term, tf, idf, tfidf in zip(terms, tf2_arr.tolist(), idf_arr.tolist(), tfidf_d2.tolist()):
             self.log_message(f"{term:<20} {tf:<15.4f} {idf:<15.4f} {tfidf:<15.4f}", 
                            self.tfidf_output)
         
         # Comparison
         self.log_message("\n" + "=" * 80, self.tfidf_output)
         self.log_message("TF-IDF COMPARISON", self.tfidf_output)
-        self.log_message("=" * 80, self.tfidf_output)
-        self.log_message(f"\n{'Term':<20} {'TF-IDF D1':<20} {'TF-IDF D2':<20}", 
-                        self.tfidf_output)
-        self.log_message("-" * 60, self.tfidf_output)
+        self.log_message("=" * 80 + "\n", self.tfidf_output)
         
-        for term in self.current_all_terms:
-            self.log_message(f"{term:<20} {tfidf_d1[term]:<20.4f} {tfidf_d2[term]:<20.4f}", 
-                           self.tfidf_output)
+        comparison = pd.DataFrame({'Term': terms, 'TF-IDF D1': tfidf_d1, 'TF-IDF D2': tfidf_d2})
+        self.log_message(comparison.to_string(index=False, float_format=lambda x: f"{x:.4f}"), 
+                        self.tfidf_output)
         
         self.tfidf_d1 = tfidf_d1
         self.tfidf_d2 = tfidf_d2
@@ -3040,15 +3591,28 @@ class BBPVPMatchingGUI:
         self.log_message("  • ||B|| = magnitude (length) of vector B", self.tfidf_output)
         
         # Create vectors
-        vec_d1 = [self.tfidf_d1[term] for term in self.current_all_terms]
-        vec_d2 = [self.tfidf_d2[term] for term in self.current_all_terms]
+        vec_d1 = self.tfidf_d1
+        vec_d2 = self.tfidf_d2
         
         self.log_message(f"\n📊 Vector D1: {[f'{v:.4f}' for v in vec_d1]}", self.tfidf_output)
         self.log_message(f"📊 Vector D2: {[f'{v:.4f}' for v in vec_d2]}", self.tfidf_output)
         
+        # Dot product and magnitudes; an all-zero vector short-circuits to 0
+        d1_nonzero = vec_d1.any()
+        d2_nonzero = vec_d2.any()
+        if not d1_nonzero or not d2_nonzero:
+            dot_product = 0.0
+            mag_d1 = float(np.linalg.norm(vec_d1)) if d1_nonzero else 0.0
+            mag_d2 = float(np.linalg.norm(vec_d2)) if d2_nonzero else 0.0
+        elif NUMBA_AVAILABLE:
+            dot_product, mag_d1, mag_d2 = _cosine_fused(vec_d1, vec_d2)
+        else:
+            dot_product = float(vec_d1 @ vec_d2)
+            mag_d1 = float(np.linalg.norm(vec_d1))
+            mag_d2 = float(np.linalg.norm(vec_d2))
+        
         # Calculate dot product
         self.log_message("\n1️⃣ Calculate Dot Product (A · B):", self.tfidf_output)
-        dot_product = sum(a * b for a, b in zip(vec_d1, vec_d2))
         self.log_message("   A · B = " + " + ".join([f"({vec_d1[i]:.4f} × {vec_d2[i]:.4f})" 
                                                     for i in range(min(5, len(vec_d1)))]) + "...", 
                         self.tfidf_output)
@@ -3056,13 +3620,11 @@ class BBPVPMatchingGUI:
         
         # Calculate magnitudes
         self.log_message("\n2️⃣ Calculate Magnitude ||A||:", self.tfidf_output)
-        mag_d1 = np.sqrt(sum(a * a for a in vec_d1))
         self.log_message(f"   ||A|| = √(" + " + ".join([f"{v:.4f}²" for v in vec_d1[:5]]) + "...)", 
                         self.tfidf_output)
         self.log_message(f"   ||A|| = {mag_d1:.6f}", self.tfidf_output)
         
         self.log_message("\n3️⃣ Calculate Magnitude ||B||:", self.tfidf_output)
-        mag_d2 = np.sqrt(sum(b * b for b in vec_d2))
         self.log_message(f"   ||B|| = √(" + " + ".join([f"{v:.4f}²" for v in vec_d2[:5]]) + "...)", 
                         self.tfidf_output)
         self.log_message(f"   ||B|| = {mag_d2:.6f}", self.tfidf_output)
@@ -3090,14 +3652,9 @@ class BBPVPMatchingGUI:
         self.log_message(f"\n  Similarity Score: {similarity:.4f} ({similarity*100:.2f}%)", 
                         self.tfidf_output)
         
-        if similarity >= 0.80:
-            interpretation = "VERY HIGH - Excellent match!"
-        elif similarity >= 0.65:
-            interpretation = "HIGH - Good match"
-        elif similarity >= 0.50:
-            interpretation = "MEDIUM - Moderate match"
-        else:
-            interpretation = "LOW - Poor match"
+        # Count of boundaries reached indexes the label, no if/elif chain
+        interpretation = SIMILARITY_INTERPRETATIONS[
+            sum(similarity >= t for t in INTERPRETATION_THRESHOLDS)]
         
         self.log_message(f"  Interpretation: {interpretation}", self.tfidf_output)
         
@@ -3108,9 +3665,18 @@ class BBPVPMatchingGUI:
         self.log_message("  • 0.50-0.65 = Medium similarity", self.tfidf_output)
         self.log_message("  • 0.00-0.50 = Low similarity", self.tfidf_output)
         
+        # Same pair scored against the whole corpus (IDF over all documents)
+        if self._vec is not None:
+            row1 = self._X_train[pel_idx]
+            row2 = self._X_jobs[low_idx]
+            norms = np.sqrt(row1.multiply(row1).sum() * row2.multiply(row2).sum())
+            corpus_similarity = (row1 @ row2.T)[0, 0] / norms if norms > 0 else 0
+            self.log_message(f"\n📚 Corpus TF-IDF Similarity (N = {self._X.shape[0]}): "
+                           f"{corpus_similarity:.4f} ({corpus_similarity*100:.2f}%)", 
+                           self.tfidf_output)
+        
         self.current_similarity = similarity
 
-        pel_idx, low_idx = self.get_selected_documents()
         self.save_tfidf_calculation(pel_idx, low_idx)
 
     def run_all_tfidf_steps(self):
@@ -3128,39 +3694,43 @@ class BBPVPMatchingGUI:
         
         for step in steps:
             step()
-            self.root.update()
+            self.root.update_idletasks()
 
-    def save_tfidf_sample_from_sklearn(self, vectorizer, tfidf_matrix, pel_idx, low_idx, similarity):
-        """Save TF-IDF calculation sample from sklearn results"""
-        if not self.current_experiment_id or not self.db_connection:
+    def build_tfidf_sample_row(self, feature_names, tfidf_matrix, pel_idx, low_idx, similarity):
+        """Build one tfidf_calculations row from sklearn results"""
+        training_name = self.df_pelatihan.iloc[pel_idx]['PROGRAM PELATIHAN']
+        job_name = self.df_lowongan.iloc[low_idx]['Nama Jabatan (Sumber Perusahaan)']
+        
+        # Build simplified JSON structures straight from the sparse rows
+        # (only non-zero values)
+        n_pelatihan = len(self.df_pelatihan)
+        tfidf_training = _row_to_dict(tfidf_matrix, pel_idx, feature_names)
+        tfidf_job = _row_to_dict(tfidf_matrix, n_pelatihan + low_idx, feature_names)
+        
+        # Get unique terms from both documents
+        unique_terms = sorted(set(list(tfidf_training.keys()) + list(tfidf_job.keys())))
+        
+        return (
+            self.current_experiment_id,
+            int(pel_idx),
+            training_name,
+            int(low_idx),
+            job_name,
+            len(unique_terms),
+            json.dumps(unique_terms),
+            json.dumps(tfidf_training),
+            json.dumps(tfidf_job),
+            float(similarity)
+        )
+
+    def save_tfidf_samples_batch(self, rows):
+        """Save TF-IDF calculation samples in one executemany + commit"""
+        if not self.current_experiment_id or not self.db_connection or not rows:
             return
         
         try:
             cursor = self.db_connection.cursor()
             
-            training_name = self.df_pelatihan.iloc[pel_idx]['PROGRAM PELATIHAN']
-            job_name = self.df_lowongan.iloc[low_idx]['Nama Jabatan (Sumber Perusahaan)']
-            
-            # Get feature names (terms)
-            feature_names = vectorizer.get_feature_names_out()
-            
-            # Get TF-IDF vectors for these documents
-            n_pelatihan = len(self.df_pelatihan)
-            training_vector = tfidf_matrix[pel_idx].toarray()[0]
-            job_vector = tfidf_matrix[n_pelatihan + low_idx].toarray()[0]
-            
-            # Build simplified JSON structures (only non-zero values)
-            tfidf_training = {term: float(training_vector[i]) 
-                            for i, term in enumerate(feature_names) 
-                            if training_vector[i] > 0}
-            
-            tfidf_job = {term: float(job_vector[i]) 
-                        for i, term in enumerate(feature_names) 
-                        if job_vector[i] > 0}
-            
-            # Get unique terms from both documents
-            unique_terms = sorted(set(list(tfidf_training.keys()) + list(tfidf_job.keys())))
-            
             query = """
             INSERT INTO tfidf_calculations 
             (experiment_id, training_index, training_name, job_index, job_name,
@@ -3168,25 +3738,64 @@ class BBPVPMatchingGUI:
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """
             
-            values = (
-                self.current_experiment_id,
-                int(pel_idx),
-                training_name,
-                int(low_idx),
-                job_name,
-                len(unique_terms),
-                json.dumps(unique_terms),
-                json.dumps(tfidf_training),
-                json.dumps(tfidf_job),
-                float(similarity)
-            )
-            
-            cursor.execute(query, values)
+            cursor.executemany(query, rows)
             self.db_connection.commit()
             cursor.close()
             
         except Error as e:
-            print(f"✗ Error saving TF-IDF sample: {e}")
+            print(f"✗ Error saving TF-IDF samples: {e}")
+
+    def build_corpus_tfidf(self):
+        """Fit TF-IDF once over all training and job documents, reusing an
+        earlier fit of the same corpus from memory or disk"""
+        # The preprocessing cache keys track the preprocessed text; the tag
+        # covers the vectorizer setup and the sklearn version that pickled it
+        for dataset_type, df in (('pelatihan', self.df_pelatihan), ('lowongan', self.df_lowongan)):
+            if dataset_type not in self._corpus_keys:
+                self._corpus_keys[dataset_type] = self.get_cache_key(df, dataset_type)
+        use_tokens = ('stemmed_tokens' in self.df_pelatihan.columns
+                      and 'stemmed_tokens' in self.df_lowongan.columns)
+        tag = f"{'tokens' if use_tokens else 'text'}_float32_sklearn{sklearn.__version__}"
+        key = hashlib.blake2b(
+            f"{self._corpus_keys['pelatihan']}|{self._corpus_keys['lowongan']}|{tag}".encode(),
+            digest_size=16).hexdigest()
+        
+        state = None
+        if self._tfidf_state is not None and self._tfidf_state[0] == key:
+            state = self._tfidf_state[1]
+        cache_file = os.path.join(self.cache_dir, f"tfidf_{key}.joblib")
+        if state is None and os.path.exists(cache_file):
+            try:
+                state = joblib.load(cache_file)
+            except Exception as e:
+                print(f"TF-IDF cache load error: {e}")
+        
+        if state is None:
+            if use_tokens:
+                # Feed the stemmed token lists directly, skipping the regex re-tokenization
+                all_docs = (self.df_pelatihan['stemmed_tokens'].tolist()
+                            + self.df_lowongan['stemmed_tokens'].tolist())
+                vectorizer = TfidfVectorizer(analyzer=_corpus_analyzer, lowercase=False,
+                                             dtype=np.float32)
+            else:
+                all_docs = pd.concat([self.df_pelatihan['preprocessed_text'],
+                                      self.df_lowongan['preprocessed_text']], ignore_index=True)
+                vectorizer = TfidfVectorizer(dtype=np.float32)
+            state = (vectorizer, vectorizer.fit_transform(all_docs))
+            try:
+                joblib.dump(state, cache_file, compress=3)
+            except Exception as e:
+                print(f"TF-IDF cache save error: {e}")
+        
+        # Only the latest fit is kept in memory
+        self._tfidf_state = (key, state)
+        vectorizer, tfidf_matrix = state
+        n_pelatihan = len(self.df_pelatihan)
+        self._vec = vectorizer
+        self._X = tfidf_matrix
+        self._X_train = tfidf_matrix[:n_pelatihan]
+        self._X_jobs = tfidf_matrix[n_pelatihan:]
+        self._similarity = None
 
     def calculate_all_documents(self):
         """Calculate similarity matrix for all documents"""
@@ -3210,33 +3819,54 @@ class BBPVPMatchingGUI:
                                 "Please run preprocessing again.")
             return
         
+        level_bins = self.checked_level_bins()
+        if level_bins is None:
+            return
+        
         self.tfidf_output.delete(1.0, tk.END)
         self.log_message("=" * 80, self.tfidf_output)
         self.log_message("CALCULATING SIMILARITY MATRIX", self.tfidf_output)
         self.log_message("=" * 80, self.tfidf_output)
         
-        # Use sklearn for full matrix (more efficient for many documents)
-        from sklearn.feature_extraction.text import TfidfVectorizer
-        from sklearn.metrics.pairwise import cosine_similarity
-        
-        # Combine all texts
-        all_texts = list(self.df_pelatihan['preprocessed_text']) + \
-                list(self.df_lowongan['preprocessed_text'])
-        
-        # Calculate TF-IDF
-        vectorizer = TfidfVectorizer()
-        tfidf_matrix = vectorizer.fit_transform(all_texts)
-        self.log_message("✓ TF-IDF vectors created\n", self.tfidf_output)
-        
-        # Split back
         n_pelatihan = len(self.df_pelatihan)
-        pelatihan_vectors = tfidf_matrix[:n_pelatihan]
-        lowongan_vectors = tfidf_matrix[n_pelatihan:]
         
-        self.log_message("Step 2/3: Calculating cosine similarities...", self.tfidf_output)
-        # Calculate similarity matrix
-        similarity_matrix = cosine_similarity(pelatihan_vectors, lowongan_vectors)
-        self.log_message("✓ Similarity matrix calculated\n", self.tfidf_output)
+        # Reuse the corpus TF-IDF fitted after preprocessing
+        if self._vec is None:
+            self.build_corpus_tfidf()
+        vectorizer = self._vec
+        tfidf_matrix = self._X
+        
+        if self._similarity is not None:
+            # Nothing changed since the last run: reuse the matrix
+            similarity_matrix = self._similarity
+            self.log_message("✓ Reusing cached TF-IDF vectors and similarity matrix\n", self.tfidf_output)
+        else:
+            self.log_message("✓ TF-IDF vectors created\n", self.tfidf_output)
+            
+            pelatihan_vectors = self._X_train
+            lowongan_vectors = self._X_jobs
+            
+            self.log_message("Step 2/3: Calculating cosine similarities...", self.tfidf_output)
+            # Calculate similarity matrix: rows are already L2-normalized by the
+            # vectorizer, so cosine similarity is a plain sparse matmul
+            density = tfidf_matrix.nnz / (tfidf_matrix.shape[0] * tfidf_matrix.shape[1])
+            if SIMSIMD_AVAILABLE and density > 0.1:
+                # Dense enough vocabulary: SIMD cosine kernels beat the sparse path
+                pel = pelatihan_vectors.toarray()
+                low = lowongan_vectors.toarray()
+                similarity_matrix = 1.0 - np.asarray(simsimd.cdist(pel, low, metric='cosine'))
+                # Empty documents have no direction; score them 0 like sklearn does
+                similarity_matrix[np.diff(pelatihan_vectors.indptr) == 0, :] = 0
+                similarity_matrix[:, np.diff(lowongan_vectors.indptr) == 0] = 0
+            elif vectorizer.norm == 'l2':
+                similarity_matrix = (pelatihan_vectors @ lowongan_vectors.T).toarray()
+            else:
+                similarity_matrix = (normalize(pelatihan_vectors) @ normalize(lowongan_vectors).T).toarray()
+            # Scores live in [0, 1]; float32 halves the memory every column slice touches
+            similarity_matrix = similarity_matrix.astype(np.float32, copy=False)
+            self.log_message("✓ Similarity matrix calculated\n", self.tfidf_output)
+            
+            self._similarity = similarity_matrix
         
         # Display results
         self.log_message("=" * 150, self.tfidf_output)
@@ -3260,14 +3890,9 @@ class BBPVPMatchingGUI:
         self.log_message(f"   • Minimum Similarity: {min_similarity:.4f} ({min_similarity*100:.2f}%)", self.tfidf_output)
         
         # Count by match levels using self.match_thresholds
-        excellent = np.sum(similarity_matrix >= self.match_thresholds['excellent'])
-        very_good = np.sum((similarity_matrix >= self.match_thresholds['very_good']) & 
-                        (similarity_matrix < self.match_thresholds['excellent']))
-        good = np.sum((similarity_matrix >= self.match_thresholds['good']) & 
-                    (similarity_matrix < self.match_thresholds['very_good']))
-        fair = np.sum((similarity_matrix >= self.match_thresholds['fair']) & 
-                    (similarity_matrix < self.match_thresholds['good']))
-        weak = np.sum(similarity_matrix < self.match_thresholds['fair'])
+        # One sweep over the matrix; the last histogram bin is closed on the right
+        level_edges = [min(0.0, min_similarity)] + level_bins.tolist() + [max(1.0, max_similarity)]
+        weak, fair, good, very_good, excellent = np.histogram(similarity_matrix, bins=level_edges)[0]
 
         self.log_message(f"\n🎯 Match Level Distribution:", self.tfidf_output)
         self.log_message(f"   • 🟢 Excellent (≥{self.match_thresholds['excellent']*100:.0f}%): {excellent} pairs ({excellent/similarity_matrix.size*100:.1f}%)", self.tfidf_output)
@@ -3300,42 +3925,37 @@ class BBPVPMatchingGUI:
             self.tfidf_output
         )
         
+        # Top 3 trainings for every job: partial selection, clamped to the rows available
+        top_3_all, top_3_scores = self.top_n_per_column(similarity_matrix, 3)
+        top_3_levels = np.searchsorted(level_bins, top_3_scores, side='right')
+        
+        # Truncate names if too long: once per column, not once per printed row
+        program_names = self.df_pelatihan['PROGRAM PELATIHAN'].astype(str)
+        program_displays = program_names.where(program_names.str.len() <= 53,
+                                               program_names.str[:51] + "..").tolist()
+        
+        job_names = self.df_lowongan['Nama Jabatan (Sumber Perusahaan)'].to_numpy()
+        
         # Process each job with progress
         total_jobs = len(self.df_lowongan)
         for low_idx in range(total_jobs):
-            lowongan_name = self.df_lowongan.iloc[low_idx]['Nama Jabatan (Sumber Perusahaan)']
+            lowongan_name = job_names[low_idx]
+            job_display = lowongan_name[:41] + ".." if len(lowongan_name) > 43 else lowongan_name
             similarities = similarity_matrix[:, low_idx]
-            top_3_indices = np.argsort(similarities)[-3:][::-1]
+            top_3_indices = top_3_all[:, low_idx]
             
             for rank, pel_idx in enumerate(top_3_indices, 1):
-                pelatihan_name = self.df_pelatihan.iloc[pel_idx]['PROGRAM PELATIHAN']
+                program_display = program_displays[pel_idx]
                 similarity = similarities[pel_idx]
                 
                 # Determine match level
-                if similarity >= self.match_thresholds['excellent']:
-                    match_level = "excellent"
-                    match_emoji = "🟢"
-                elif similarity >= self.match_thresholds['very_good']:
-                    match_level = "very_good"
-                    match_emoji = "🟢"
-                elif similarity >= self.match_thresholds['good']:
-                    match_level = "good"
-                    match_emoji = "🟡"
-                elif similarity >= self.match_thresholds['fair']:
-                    match_level = "fair"
-                    match_emoji = "🟡"
-                else:
-                    match_level = "weak"
-                    match_emoji = "🔴"
+                level = top_3_levels[rank - 1, low_idx]
+                match_level, match_emoji = MATCH_LEVELS[level]
                 
-                # Truncate names if too long
-                job_display = lowongan_name[:41] + ".." if len(lowongan_name) > 43 else lowongan_name
-                program_display = pelatihan_name[:51] + ".." if len(pelatihan_name) > 53 else pelatihan_name
-                
-                self.log_message(
-                    f"│ {low_idx:<4} │ {job_display:<43} │ {program_display:<53} │ {rank:<4} │ {similarity:<11.8f} │ {similarity*100:<8.2f} │ {match_emoji} {match_level:<8} │",
-                    self.tfidf_output
+                self._log_buf(
+                    f"│ {low_idx:<4} │ {job_display:<43} │ {program_display:<53} │ {rank:<4} │ {similarity:<11.8f} │ {similarity*100:<8.2f} │ {match_emoji} {match_level:<8} │"
                 )
+        self._flush_log_buf(self.tfidf_output)
 
         # Table footer
         self.log_message(
@@ -3363,19 +3983,35 @@ class BBPVPMatchingGUI:
         self.log_message("\nSaving sample TF-IDF calculations to database...", self.tfidf_output)
         sample_count = min(5, len(self.df_lowongan))
         
-        for low_idx in range(sample_count):
-            similarities = similarity_matrix[:, low_idx]
-            top_pel_idx = np.argmax(similarities)
-            self.save_tfidf_sample_from_sklearn(
-                vectorizer, 
-                tfidf_matrix, 
-                top_pel_idx, 
-                low_idx, 
-                similarities[top_pel_idx]
-            )
+        if self.current_experiment_id and self.db_connection:
+            feature_names = vectorizer.get_feature_names_out()
+            rows = []
+            for low_idx in range(sample_count):
+                similarities = similarity_matrix[:, low_idx]
+                top_pel_idx = np.argmax(similarities)
+                rows.append(self.build_tfidf_sample_row(
+                    feature_names, 
+                    tfidf_matrix, 
+                    top_pel_idx, 
+                    low_idx, 
+                    similarities[top_pel_idx]
+                ))
+            self.save_tfidf_samples_batch(rows)
         
         self.log_message(f"\n✓ Saved {sample_count} TF-IDF calculation samples", self.tfidf_output)
 
+    def format_stemming_table(self, tokens, stemmed_tokens, limit=99):
+        """Build the before/after stemming table as one string"""
+        lines = [
+            "┌──────┬─────────────────────┬─────────────────────┬─────────────┐",
+            "│  No  │   Before Stemming   │   After Stemming    │   Status    │",
+            "├──────┼─────────────────────┼─────────────────────┼─────────────┤"
+        ]
+        lines += [f"│ {i:4d} │ {before:19s} │ {after:19s} │ {' Changed ' if before != after else 'Unchanged':11s} │"
+                  for i, (before, after) in enumerate(zip(tokens[:limit], stemmed_tokens[:limit]), 1)]
+        lines.append("└──────┴─────────────────────┴─────────────────────┴─────────────┘")
+        return "\n".join(lines)
+
     def show_preprocessing_step(self, step):
         """Show specific preprocessing step for selected row"""
         self.preprocess_output.delete(1.0, tk.END)
@@ -3479,14 +4115,8 @@ class BBPVPMatchingGUI:
                 self.log_message("\n→ Tokens After Stemming:", self.preprocess_output)
                 self.log_message(str(stemmed_tokens[:20]) + "...", self.preprocess_output)
                 self.log_message("\n\nStemming Results (word by word) (displayed max 99):", self.preprocess_output)
-                self.log_message("\n┌──────┬─────────────────────┬─────────────────────┬─────────────┐", self.preprocess_output)
-                self.log_message("│  No  │   Before Stemming   │   After Stemming    │   Status    │", self.preprocess_output)
-                self.log_message("├──────┼─────────────────────┼─────────────────────┼─────────────┤", self.preprocess_output)
-                for i, (before, after) in enumerate(zip(tokens[:99], stemmed_tokens[:99]), 1):
-                    status = " Changed " if before != after else "Unchanged"
-                    self.log_message(f"│ {i:4d} │ {before:19s} │ {after:19s} │ {status:11s} │", 
-                                   self.preprocess_output)
-                self.log_message("└──────┴─────────────────────┴─────────────────────┴─────────────┘", self.preprocess_output)
+                self.log_message("\n" + self.format_stemming_table(tokens, stemmed_tokens), 
+                               self.preprocess_output)
                 self.log_message(f"\n\nFinal text after stemming:", self.preprocess_output)
                 self.log_message(stemmed_text[:200] + "...", self.preprocess_output)
             else:
@@ -3519,14 +4149,8 @@ class BBPVPMatchingGUI:
                 stemmed_text = ' '.join(stemmed_tokens)
                 self.log_message("[STEP 4: STEMMING (per token) (displayed max 99)]", self.preprocess_output)
                 self.log_message("Stemming results:\n", self.preprocess_output)
-                self.log_message("┌──────┬─────────────────────┬─────────────────────┬─────────────┐", self.preprocess_output)
-                self.log_message("│  No  │   Before Stemming   │   After Stemming    │   Status    │", self.preprocess_output)
-                self.log_message("├──────┼─────────────────────┼─────────────────────┼─────────────┤", self.preprocess_output)
-                for i, (before, after) in enumerate(zip(tokens[:99], stemmed_tokens[:99]), 1):
-                    status = " Changed " if before != after else "Unchanged"
-                    self.log_message(f"│ {i:4d} │ {before:19s} │ {after:19s} │ {status:11s} │", 
-                                   self.preprocess_output)
-                self.log_message("└──────┴─────────────────────┴─────────────────────┴─────────────┘", self.preprocess_output)
+                self.log_message(self.format_stemming_table(tokens, stemmed_tokens), 
+                               self.preprocess_output)
                 self.log_message(f"\nStemmed text: {stemmed_text[:150]}...", self.preprocess_output)
                 self.log_message(f"\nFinal tokens: {stemmed_tokens[:15]}...", self.preprocess_output)
                 self.log_message(f"Total: {len(stemmed_tokens)} tokens", self.preprocess_output)
@@ -3536,6 +4160,17 @@ class BBPVPMatchingGUI:
         self.preprocess_output.delete(1.0, tk.END)
         self.log_message("Processing all data...", self.preprocess_output)
         
+        # Tokens may change, so the corpus TF-IDF keys and fit are stale
+        self._corpus_keys = {}
+        self._vec = None
+        self._similarity = None
+        
+        def _pipeline(text):
+            # Normalize, remove stopwords and tokenize in a single pass per row
+            normalized = self.normalize_text(text)
+            no_stopwords = self.remove_stopwords(normalized)
+            return normalized, no_stopwords, self.tokenize_text(no_stopwords)
+        
         def process():
             # Process Training Data
             if self.df_pelatihan is not None:
@@ -3544,7 +4179,8 @@ class BBPVPMatchingGUI:
                 self.log_message("=" * 80 + "\n", self.preprocess_output)
                 
                 # Generate cache key
-                cache_key = f"training_{self.get_cache_key(self.df_pelatihan, 'pelatihan')}"
+                self._corpus_keys['pelatihan'] = self.get_cache_key(self.df_pelatihan, 'pelatihan')
+                cache_key = f"training_{self._corpus_keys['pelatihan']}"
                 
                 # Try to load from cache
                 self.log_message("Checking cache...", self.preprocess_output)
@@ -3553,10 +4189,10 @@ class BBPVPMatchingGUI:
                 if cached_data is not None:
                     self.log_message("Cache found! Loading preprocessed data...", self.preprocess_output)
                     # Restore cached columns
-                    for col in ['text_features', 'normalized', 'no_stopwords', 'tokens', 
-                               'stemmed_tokens', 'stemmed', 'token_count', 'preprocessed_text']:
+                    for col in ['text_features', 'stemmed_tokens', 'stemmed', 'token_count']:
                         if col in cached_data:
                             self.df_pelatihan[col] = cached_data[col]
+                    self.df_pelatihan['preprocessed_text'] = self.df_pelatihan['stemmed']
                     self.log_message(f"Loaded {len(self.df_pelatihan)} training programs from cache\n", 
                                 self.preprocess_output)
                 else:
@@ -3564,57 +4200,51 @@ class BBPVPMatchingGUI:
                     
                     # Combine text features
                     self.df_pelatihan['text_features'] = (
-                        self.df_pelatihan['Deskripsi Tujuan Program Pelatihan/Kompetensi'].fillna('')
+                        self.df_pelatihan['Deskripsi Tujuan Program Pelatihan/Kompetensi'].fillna('').astype(str)
                     )
                     
                     # Apply preprocessing
-                    self.log_message("Step 1/5: Normalizing...", self.preprocess_output)
-                    self.df_pelatihan['normalized'] = self.df_pelatihan['text_features'].apply(
-                        self.normalize_text)
-                    self.log_message("Normalization completed\n", self.preprocess_output)
-                    
-                    self.log_message("Step 2/5: Removing stopwords...", self.preprocess_output)
-                    self.df_pelatihan['no_stopwords'] = self.df_pelatihan['normalized'].apply(
-                        self.remove_stopwords)
-                    self.log_message("Stopword removal completed\n", self.preprocess_output)
-                    
-                    self.log_message("Step 3/5: Tokenizing...", self.preprocess_output)
-                    self.df_pelatihan['tokens'] = self.df_pelatihan['no_stopwords'].apply(
-                        self.tokenize_text)
-                    self.log_message("Tokenization completed\n", self.preprocess_output)
+                    self.log_message("Step 1-3/5: Normalizing, removing stopwords, tokenizing...", 
+                                self.preprocess_output)
+                    # Preprocess each distinct text once; only the stemmed results
+                    # are mapped back, the intermediate stages are not kept per row
+                    codes, uniques = pd.factorize(self.df_pelatihan['text_features'])
+                    token_lists = self._preprocess_series(pd.Series(uniques))
+                    self.log_message("Normalization, stopword removal and tokenization completed\n", 
+                                self.preprocess_output)
                     
                     self.log_message("Step 4/5: Stemming (per token) - this may take a while...", self.preprocess_output)
                     
                     # Progress bar for stemming
                     stemmed_tokens_list = []
-                    for idx, tokens in enumerate(self.df_pelatihan['tokens']):
-                        stemmed = self.stem_tokens(tokens)
+                    stemmed_texts = []
+                    token_counts = []
+                    stemmed_docs = self.iter_stemmed_documents(token_lists)
+                    for idx, stemmed in enumerate(stemmed_docs):
+                        # Join and count in the same pass as stemming
                         stemmed_tokens_list.append(stemmed)
+                        stemmed_texts.append(' '.join(stemmed))
+                        token_counts.append(len(stemmed))
                         
-                        if idx % 10 == 0 or idx == len(self.df_pelatihan) - 1:
-                            self.update_progress(idx + 1, len(self.df_pelatihan), 
+                        if idx % 10 == 0 or idx == len(uniques) - 1:
+                            self.update_progress(idx + 1, len(uniques), 
                                             "Stemming training data", self.preprocess_output)
                     
-                    self.df_pelatihan['stemmed_tokens'] = stemmed_tokens_list
+                    self.df_pelatihan['stemmed_tokens'] = [stemmed_tokens_list[c] for c in codes]
                     self.log_message("\nStemming (per token) completed\n", self.preprocess_output)
                     
                     self.log_message("Step 5/5: Finalizing...", self.preprocess_output)
-                    self.df_pelatihan['stemmed'] = self.df_pelatihan['stemmed_tokens'].apply(
-                        lambda x: ' '.join(x))
-                    self.df_pelatihan['token_count'] = self.df_pelatihan['stemmed_tokens'].apply(len)
+                    self.df_pelatihan['stemmed'] = [stemmed_texts[c] for c in codes]
+                    self.df_pelatihan['token_count'] = np.array(token_counts, dtype=np.int32)[codes]
                     self.df_pelatihan['preprocessed_text'] = self.df_pelatihan['stemmed']
                     
                     # Save to cache
                     self.log_message("Saving to cache for future use...", self.preprocess_output)
                     cache_data = {
                         'text_features': self.df_pelatihan['text_features'],
-                        'normalized': self.df_pelatihan['normalized'],
-                        'no_stopwords': self.df_pelatihan['no_stopwords'],
-                        'tokens': self.df_pelatihan['tokens'],
                         'stemmed_tokens': self.df_pelatihan['stemmed_tokens'],
                         'stemmed': self.df_pelatihan['stemmed'],
-                        'token_count': self.df_pelatihan['token_count'],
-                        'preprocessed_text': self.df_pelatihan['preprocessed_text']
+                        'token_count': self.df_pelatihan['token_count']
                     }
                     if self.save_to_cache(cache_key, cache_data):
                         self.log_message("Cache saved successfully\n", self.preprocess_output)
@@ -3632,7 +4262,8 @@ class BBPVPMatchingGUI:
                 self.log_message("=" * 80 + "\n", self.preprocess_output)
                 
                 # Generate cache key
-                cache_key = f"job_{self.get_cache_key(self.df_lowongan, 'lowongan')}"
+                self._corpus_keys['lowongan'] = self.get_cache_key(self.df_lowongan, 'lowongan')
+                cache_key = f"job_{self._corpus_keys['lowongan']}"
                 
                 # Try to load from cache
                 self.log_message("Checking cache...", self.preprocess_output)
@@ -3641,10 +4272,10 @@ class BBPVPMatchingGUI:
                 if cached_data is not None:
                     self.log_message("Cache found! Loading preprocessed data...", self.preprocess_output)
                     # Restore cached columns
-                    for col in ['text_features', 'normalized', 'no_stopwords', 'tokens', 
-                               'stemmed_tokens', 'stemmed', 'token_count', 'preprocessed_text']:
+                    for col in ['text_features', 'stemmed_tokens', 'stemmed', 'token_count']:
                         if col in cached_data:
                             self.df_lowongan[col] = cached_data[col]
+                    self.df_lowongan['preprocessed_text'] = self.df_lowongan['stemmed']
                     self.log_message(f"Loaded {len(self.df_lowongan)} job positions from cache\n", 
                                 self.preprocess_output)
                 else:
@@ -3652,57 +4283,51 @@ class BBPVPMatchingGUI:
                     
                     # Combine text features
                     self.df_lowongan['text_features'] = (
-                        self.df_lowongan['Deskripsi Pekerjaan'].fillna('')
+                        self.df_lowongan['Deskripsi Pekerjaan'].fillna('').astype(str)
                     )
                     
                     # Apply preprocessing
-                    self.log_message("Step 1/5: Normalizing...", self.preprocess_output)
-                    self.df_lowongan['normalized'] = self.df_lowongan['text_features'].apply(
-                        self.normalize_text)
-                    self.log_message("Normalization completed\n", self.preprocess_output)
-                    
-                    self.log_message("Step 2/5: Removing stopwords...", self.preprocess_output)
-                    self.df_lowongan['no_stopwords'] = self.df_lowongan['normalized'].apply(
-                        self.remove_stopwords)
-                    self.log_message("Stopword removal completed\n", self.preprocess_output)
-                    
-                    self.log_message("Step 3/5: Tokenizing...", self.preprocess_output)
-                    self.df_lowongan['tokens'] = self.df_lowongan['no_stopwords'].apply(
-                        self.tokenize_text)
-                    self.log_message("Tokenization completed\n", self.preprocess_output)
+                    self.log_message("Step 1-3/5: Normalizing, removing stopwords, tokenizing...", 
+                                self.preprocess_output)
+                    # Preprocess each distinct text once; only the stemmed results
+                    # are mapped back, the intermediate stages are not kept per row
+                    codes, uniques = pd.factorize(self.df_lowongan['text_features'])
+                    token_lists = self._preprocess_series(pd.Series(uniques))
+                    self.log_message("Normalization, stopword removal and tokenization completed\n", 
+                                self.preprocess_output)
                     
                     self.log_message("Step 4/5: Stemming (per token) - this may take a while...", self.preprocess_output)
                     
                     # Progress bar for stemming
                     stemmed_tokens_list = []
-                    for idx, tokens in enumerate(self.df_lowongan['tokens']):
-                        stemmed = self.stem_tokens(tokens)
+                    stemmed_texts = []
+                    token_counts = []
+                    stemmed_docs = self.iter_stemmed_documents(token_lists)
+                    for idx, stemmed in enumerate(stemmed_docs):
+                        # Join and count in the same pass as stemming
                         stemmed_tokens_list.append(stemmed)
+                        stemmed_texts.append(' '.join(stemmed))
+                        token_counts.append(len(stemmed))
                         
-                        if idx % 10 == 0 or idx == len(self.df_lowongan) - 1:
-                            self.update_progress(idx + 1, len(self.df_lowongan), 
+                        if idx % 10 == 0 or idx == len(uniques) - 1:
+                            self.update_progress(idx + 1, len(uniques), 
                                             "Stemming job data", self.preprocess_output)
                     
-                    self.df_lowongan['stemmed_tokens'] = stemmed_tokens_list
+                    self.df_lowongan['stemmed_tokens'] = [stemmed_tokens_list[c] for c in codes]
                     self.log_message("\nStemming (per token) completed\n", self.preprocess_output)
                     
                     self.log_message("Step 5/5: Finalizing...", self.preprocess_output)
-                    self.df_lowongan['stemmed'] = self.df_lowongan['stemmed_tokens'].apply(
-                        lambda x: ' '.join(x))
-                    self.df_lowongan['token_count'] = self.df_lowongan['stemmed_tokens'].apply(len)
+                    self.df_lowongan['stemmed'] = [stemmed_texts[c] for c in codes]
+                    self.df_lowongan['token_count'] = np.array(token_counts, dtype=np.int32)[codes]
                     self.df_lowongan['preprocessed_text'] = self.df_lowongan['stemmed']
                     
                     # Save to cache
                     self.log_message("Saving to cache for future use...", self.preprocess_output)
                     cache_data = {
                         'text_features': self.df_lowongan['text_features'],
-                        'normalized': self.df_lowongan['normalized'],
-                        'no_stopwords': self.df_lowongan['no_stopwords'],
-                        'tokens': self.df_lowongan['tokens'],
                         'stemmed_tokens': self.df_lowongan['stemmed_tokens'],
                         'stemmed': self.df_lowongan['stemmed'],
-                        'token_count': self.df_lowongan['token_count'],
-                        'preprocessed_text': self.df_lowongan['preprocessed_text']
+                        'token_count': self.df_lowongan['token_count']
                     }
                     if self.save_to_cache(cache_key, cache_data):
                         self.log_message("Cache saved successfully\n", self.preprocess_output)
@@ -3716,23 +4341,101 @@ class BBPVPMatchingGUI:
             self.log_message("\n" + "=" * 80, self.preprocess_output)
             self.log_message("ALL DATA PROCESSING COMPLETED!", self.preprocess_output)
             self.log_message("=" * 80, self.preprocess_output)
+            
+            self.save_stem_cache()
+
+            if self.df_pelatihan is not None and self.df_lowongan is not None:
+                self.build_corpus_tfidf()
+                self.log_message(f"\n✓ Corpus TF-IDF built: {len(self._vec.vocabulary_)} terms", 
+                            self.preprocess_output)
         
-            if self.df_pelatihan is not None:
+            if self.current_experiment_id and self.db_connection:
                 self.log_message("\nSaving preprocessing samples...", self.preprocess_output)
-                for idx in range(min(self.total_saved_sample, len(self.df_pelatihan))):
-                    self.save_preprocessing_sample('training', idx, self.df_pelatihan.iloc[idx])
-                    self.update_progress(idx + 1, self.total_saved_sample, 
-                                    "Saving training samples", self.preprocess_output)
+                sample_rows = []
+                for dataset_type, df, name_col in (
+                    ('training', self.df_pelatihan, 'PROGRAM PELATIHAN'),
+                    ('job', self.df_lowongan, 'Nama Jabatan (Sumber Perusahaan)'),
+                ):
+                    if df is None:
+                        continue
+                    # Plain tuples in SAMPLE_COLUMNS order, no per-row Series
+                    sample = df[[name_col, *self.SAMPLE_COLUMNS]].head(self.total_saved_sample)
+                    for idx, (record_name, text_features, stemmed, token_count) in enumerate(
+                            sample.itertuples(index=False, name=None)):
+                        # Intermediate stages are not stored on the frame; redo them for the samples
+                        normalized, no_stopwords, tokens = _pipeline(text_features)
+                        sample_rows.append(self.build_preprocessing_sample_row(
+                            dataset_type, idx, record_name, text_features,
+                            normalized, no_stopwords, tokens, stemmed, token_count))
+                self.save_preprocessing_samples_batch(sample_rows)
+                self.log_message("✓ Preprocessing samples queued for saving", self.preprocess_output)
+        threading.Thread(target=process, daemon=True).start()
 
-            if self.df_lowongan is not None:
-                self.log_message("\n", self.preprocess_output)
-                for idx in range(min(self.total_saved_sample, len(self.df_lowongan))):
-                    self.save_preprocessing_sample('job', idx, self.df_lowongan.iloc[idx])
-                    self.update_progress(idx + 1, self.total_saved_sample, 
-                                    "Saving job samples", self.preprocess_output)
+    def get_level_bins(self):
+        """Sorted lower bounds of fair, good, very_good and excellent matches"""
+        bins = np.array([self.match_thresholds['fair'], self.match_thresholds['good'],
+                         self.match_thresholds['very_good'], self.match_thresholds['excellent']])
+        # searchsorted and histogram both assume strictly increasing edges
+        if not np.all(np.diff(bins) > 0):
+            raise ValueError("Thresholds must be in descending order:\n"
+                             "Excellent > Very Good > Good > Fair ≥ 0")
+        return bins
 
-            self.log_message("\n✓ Preprocessing samples saved to database", self.preprocess_output)
-        threading.Thread(target=process, daemon=True).start()
+    def checked_level_bins(self):
+        """get_level_bins, or None after showing an error for out-of-order thresholds"""
+        try:
+            return self.get_level_bins()
+        except ValueError as e:
+            messagebox.showerror("Invalid Settings", str(e))
+            return None
+
+    def new_recommendation_columns(self, columns):
+        """Empty column-oriented recommendation store (column name -> list)"""
+        return {col: [] for col in columns}
+
+    def append_recommendation(self, values, store=None):
+        """Append one recommendation, given as values in column order, to store
+        (default: all_recommendations)"""
+        if store is None:
+            store = self.all_recommendations
+        for column, value in zip(store.values(), values):
+            column.append(value)
+
+    def recommendation_count(self):
+        """Number of stored recommendation rows"""
+        if not getattr(self, 'all_recommendations', None):
+            return 0
+        return len(self.all_recommendations['Rank'])
+
+    def top_n_indices(self, similarities, threshold, n):
+        """Indices of the top n scores >= threshold (best first) and the match count"""
+        candidates = np.nonzero(similarities >= threshold)[0]
+        n_found = len(candidates)
+        if n_found > n:
+            candidates = candidates[np.argpartition(-similarities[candidates], n)[:n]]
+        order = np.argsort(-similarities[candidates], kind='stable')
+        return candidates[order], n_found
+
+    def top_n_per_column(self, matrix, n):
+        """Top n row indices of every column (best first) with their scores"""
+        k = min(n, matrix.shape[0])
+        if k <= 0:
+            empty = np.empty((0, matrix.shape[1]), dtype=np.intp)
+            return empty, empty.astype(matrix.dtype)
+        top = np.argpartition(-matrix, k - 1, axis=0)[:k]
+        scores = np.take_along_axis(matrix, top, axis=0)
+        order = np.argsort(-scores, axis=0, kind='stable')
+        return np.take_along_axis(top, order, axis=0), np.take_along_axis(scores, order, axis=0)
+
+    def get_name_arrays(self):
+        """Training, job and company name columns as arrays for the recommendation loops"""
+        program_names = self.df_pelatihan['PROGRAM PELATIHAN'].to_numpy()
+        job_names = self.df_lowongan['Nama Jabatan (Sumber Perusahaan)'].to_numpy()
+        if 'NAMA PERUSAHAAN' in self.df_lowongan.columns:
+            company_names = self.df_lowongan['NAMA PERUSAHAAN'].to_numpy()
+        else:
+            company_names = np.full(len(self.df_lowongan), '-', dtype=object)
+        return program_names, job_names, company_names
 
     def load_recommendation_options(self):
         """Load job options for recommendations"""
@@ -3740,16 +4443,16 @@ class BBPVPMatchingGUI:
         success_training = False
         
         if self.df_lowongan is not None:
-            job_options = [f"{i}: {row['Nama Jabatan (Sumber Perusahaan)']}" 
-                        for i, row in self.df_lowongan.iterrows()]
+            job_options = [f"{i}: {name}" 
+                        for i, name in self.df_lowongan['Nama Jabatan (Sumber Perusahaan)'].items()]
             self.rec_job_combo['values'] = job_options
             if job_options:
                 self.rec_job_combo.current(0)
             success_job = True
         
         if self.df_pelatihan is not None:
-            training_options = [f"{i}: {row['PROGRAM PELATIHAN']}" 
-                        for i, row in self.df_pelatihan.iterrows()]
+            training_options = [f"{i}: {name}" 
+                        for i, name in self.df_pelatihan['PROGRAM PELATIHAN'].items()]
             self.rec_training_combo['values'] = training_options
             if training_options:
                 self.rec_training_combo.current(0)
@@ -3775,6 +4478,10 @@ class BBPVPMatchingGUI:
             messagebox.showerror("Error", "Invalid parameters!")
             return
         
+        level_bins = self.checked_level_bins()
+        if level_bins is None:
+            return
+        
         # Display header
         self.log_message("=" * 170, self.rec_output)
         self.log_message("JOB POSITION RECOMMENDATIONS - ALL TRAINING PROGRAMS", self.rec_output)
@@ -3782,7 +4489,7 @@ class BBPVPMatchingGUI:
         self.log_message(f"\n📊 Configuration: Top N = {n_recommendations} per training | Threshold = {threshold:.2f} | Training = {len(self.df_pelatihan)} | Jobs = {len(self.df_lowongan)}", self.rec_output)
         
         # Store all recommendations for export
-        self.all_recommendations = []
+        self.all_recommendations = self.new_recommendation_columns(TRAINING_REC_COLUMNS)
         
         # SQL-style table header with Company column
         self.log_message("\n" + "=" * 170, self.rec_output)
@@ -3803,24 +4510,30 @@ class BBPVPMatchingGUI:
             self.rec_output
         )
         
+        # Top N jobs of every training program in one pass
+        top_idx, top_scores = self.top_n_per_column(self.similarity_matrix.T, n_recommendations)
+        top_levels = np.searchsorted(level_bins, top_scores, side='right')
+        
+        program_names, job_names, company_names = self.get_name_arrays()
+        
         # Process each training program
         for training_idx in range(len(self.df_pelatihan)):
-            training_name = self.df_pelatihan.iloc[training_idx]['PROGRAM PELATIHAN']
+            training_name = program_names[training_idx]
             similarities = self.similarity_matrix[training_idx, :]
             
-            # Get top N that meet threshold
-            top_indices = np.argsort(similarities)[::-1]
-            filtered_indices = [idx for idx in top_indices 
-                            if similarities[idx] >= threshold][:n_recommendations]
+            # Keep the top N that meet threshold
+            keep = top_scores[:, training_idx] >= threshold
+            filtered_indices = top_idx[keep, training_idx]
+            levels = top_levels[keep, training_idx]
             
-            if not filtered_indices:
+            if len(filtered_indices) == 0:
                 continue
             
             for rank, job_idx in enumerate(filtered_indices, 1):
                 similarity = similarities[job_idx]
                 
                 # NEW: Get company name and handle NO_MATCH
-                company_name = self.df_lowongan.iloc[job_idx].get('NAMA PERUSAHAAN', '-')
+                company_name = company_names[job_idx]
                 is_no_match = similarity == 0
                 
                 if is_no_match:
@@ -3828,47 +4541,33 @@ class BBPVPMatchingGUI:
                     match_level = "NO_MATCH"
                     match_emoji = "❌"
                 else:
-                    job_name = self.df_lowongan.iloc[job_idx]['Nama Jabatan (Sumber Perusahaan)']
+                    job_name = job_names[job_idx]
                     # Determine match level
-                    if similarity >= self.match_thresholds['excellent']:
-                        match_level = "excellent"
-                        match_emoji = "🟢"
-                    elif similarity >= self.match_thresholds['very_good']:
-                        match_level = "very_good"
-                        match_emoji = "🟢"
-                    elif similarity >= self.match_thresholds['good']:
-                        match_level = "good"
-                        match_emoji = "🟡"
-                    elif similarity >= self.match_thresholds['fair']:
-                        match_level = "fair"
-                        match_emoji = "🟡"
-                    else:
-                        match_level = "weak"
-                        match_emoji = "🔴"
+                    level = levels[rank - 1]
+                    match_level, match_emoji = MATCH_LEVELS[level]
                 
                 # Truncate names if too long
                 training_display = training_name[:46] + ".." if len(training_name) > 48 else training_name
                 company_display = company_name[:36] + ".." if len(company_name) > 38 else company_name
                 job_display = job_name[:31] + ".." if len(job_name) > 33 else job_name
                 
-                self.log_message(
-                    f"│ {training_idx:<6} │ {training_display:<48} │ {company_display:<38} │ {job_display:<33} │ {rank:<4} │ {similarity:<11.8f} │ {match_emoji} {match_level:<8} │",
-                    self.rec_output
-                )
+                self._log_buf(f"│ {training_idx:<6} │ {training_display:<48} │ {company_display:<38} │ {job_display:<33} │ {rank:<4} │ {similarity:<11.8f} │ {match_emoji} {match_level:<8} │")
                 
                 # Store for export
-                self.all_recommendations.append({
-                    'Training_Index': training_idx,
-                    'Training_Program': training_name,
-                    'Rank': rank,
-                    'Job_Index': int(job_idx) if not is_no_match else None,
-                    'Job_Name': job_name,
-                    'Company_Name': company_name,
-                    'Similarity_Score': similarity,
-                    'Similarity_Percentage': similarity * 100,
-                    'Status': 'NO_MATCH' if is_no_match else 'MATCH',
-                    'Recommendation': 'Rekomendasi dibuka pelatihan baru' if is_no_match else ''
-                })
+                self.append_recommendation((
+                    training_idx,
+                    training_name,
+                    rank,
+                    int(job_idx) if not is_no_match else None,
+                    job_name,
+                    company_name,
+                    similarity,
+                    similarity * 100,
+                    'NO_MATCH' if is_no_match else 'MATCH',
+                    'Rekomendasi dibuka pelatihan baru' if is_no_match else '',
+                ))
+        
+        self._flush_log_buf(self.rec_output)
         
         # Table footer
         self.log_message(
@@ -3876,13 +4575,12 @@ class BBPVPMatchingGUI:
             self.rec_output
         )
                 
-        self.save_recommendations()
-        self.complete_experiment()
+        self.save_recommendations(complete=True)
 
         self.log_message("\n" + "=" * 170, self.rec_output)
         self.log_message("✅ ALL RECOMMENDATIONS COMPLETE", self.rec_output)
         self.log_message("=" * 170, self.rec_output)
-        self.log_message(f"\nTotal: {len(self.all_recommendations)} recommendations | Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 
+        self.log_message(f"\nTotal: {self.recommendation_count()} recommendations | Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 
                     self.rec_output)
         self.log_message(f"💡 Export available via buttons above", self.rec_output)
 
@@ -3913,6 +4611,10 @@ class BBPVPMatchingGUI:
             messagebox.showerror("Error", "Please select a training program!")
             return
         
+        level_bins = self.checked_level_bins()
+        if level_bins is None:
+            return
+        
         training_name = self.df_pelatihan.iloc[training_idx]['PROGRAM PELATIHAN']
         training_desc = self.df_pelatihan.iloc[training_idx].get('Deskripsi Tujuan Program Pelatihan/Kompetensi', 'N/A')
                 
@@ -3920,9 +4622,9 @@ class BBPVPMatchingGUI:
         similarities = self.similarity_matrix[training_idx, :]
         
         # Filter by threshold first, then get top N
-        filtered_indices = [i for i in range(len(similarities)) if similarities[i] >= threshold]
+        top_indices, n_found = self.top_n_indices(similarities, threshold, n_recommendations)
         
-        if not filtered_indices:
+        if n_found == 0:
             self.log_message("=" * 150, self.rec_output)
             self.log_message("NO RECOMMENDATIONS FOUND", self.rec_output)
             self.log_message("=" * 150, self.rec_output)
@@ -3931,10 +4633,6 @@ class BBPVPMatchingGUI:
             self.log_message(f"\nTry lowering the minimum similarity threshold.", self.rec_output)
             return
         
-        # Sort filtered indices by similarity and take top N
-        filtered_indices.sort(key=lambda i: similarities[i], reverse=True)
-        top_indices = filtered_indices[:n_recommendations]
-        
         # Display header
         self.log_message("=" * 150, self.rec_output)
         self.log_message("JOB POSITION RECOMMENDATIONS - SINGLE TRAINING PROGRAM", self.rec_output)
@@ -3943,10 +4641,10 @@ class BBPVPMatchingGUI:
         self.log_message(f"\n🎯 TRAINING PROGRAM: {training_name}", self.rec_output)
         self.log_message(f"📄 Description: {training_desc[:120]}...", self.rec_output)
         
-        self.log_message(f"\n⚙️ Settings: Top N = {n_recommendations} | Threshold = {threshold:.2f} | Found = {len(filtered_indices)} jobs", self.rec_output)
+        self.log_message(f"\n⚙️ Settings: Top N = {n_recommendations} | Threshold = {threshold:.2f} | Found = {n_found} jobs", self.rec_output)
         
         # Display as SQL-style table
-        self.log_message(f"\n\n📊 RECOMMENDATION RESULTS (Showing {len(top_indices)} of {len(filtered_indices)} matches):", self.rec_output)
+        self.log_message(f"\n\n📊 RECOMMENDATION RESULTS (Showing {len(top_indices)} of {n_found} matches):", self.rec_output)
         self.log_message("=" * 150, self.rec_output)
         
         # Table header (without Note column)
@@ -3968,12 +4666,16 @@ class BBPVPMatchingGUI:
         )
         
         # Store for export
-        self.all_recommendations = []
+        self.all_recommendations = self.new_recommendation_columns(TRAINING_REC_COLUMNS)
+        
+        program_names, job_names, company_names = self.get_name_arrays()
+        
+        levels = np.searchsorted(level_bins, similarities[top_indices], side='right')
         
         # Table rows
         for rank, job_idx in enumerate(top_indices, 1):
-            job_name = self.df_lowongan.iloc[job_idx]['Nama Jabatan (Sumber Perusahaan)']
-            company_name = self.df_lowongan.iloc[job_idx].get('NAMA PERUSAHAAN', '-')  
+            job_name = job_names[job_idx]
+            company_name = company_names[job_idx]
             similarity = similarities[job_idx]
             
             # Determine match level
@@ -3986,45 +4688,31 @@ class BBPVPMatchingGUI:
             else:
                 job_name_display = job_name
                 # Determine match level using self.match_thresholds
-                if similarity >= self.match_thresholds['excellent']:
-                    match_level = "excellent"
-                    match_emoji = "🟢"
-                elif similarity >= self.match_thresholds['very_good']:
-                    match_level = "very_good"
-                    match_emoji = "🟢"
-                elif similarity >= self.match_thresholds['good']:
-                    match_level = "good"
-                    match_emoji = "🟡"
-                elif similarity >= self.match_thresholds['fair']:
-                    match_level = "fair"
-                    match_emoji = "🟡"
-                else:
-                    match_level = "weak"
-                    match_emoji = "🔴"
+                level = levels[rank - 1]
+                match_level, match_emoji = MATCH_LEVELS[level]
             
             # Truncate names if too long
             training_display = training_name[:46] + ".." if len(training_name) > 48 else training_name
             job_display = job_name_display[:46] + ".." if len(job_name_display) > 48 else job_name_display
             company_display = company_name[:26] + ".." if len(company_name) > 28 else company_name
             
-            self.log_message(
-                f"│ {training_idx:<6} │ {training_display:<48} │ {job_display:<48} │ {rank:<4} │ {similarity:<11.8f} │ {similarity*100:<8.2f} │ {match_emoji} {match_level:<8} │",
-                self.rec_output
-            )
+            self._log_buf(f"│ {training_idx:<6} │ {training_display:<48} │ {job_display:<48} │ {rank:<4} │ {similarity:<11.8f} │ {similarity*100:<8.2f} │ {match_emoji} {match_level:<8} │")
             
             # Store for export
-            self.all_recommendations.append({
-                'Training_Index': training_idx,
-                'Training_Program': training_name,
-                'Rank': rank,
-                'Job_Index': int(job_idx) if not is_no_match else None,
-                'Job_Name': job_name if not is_no_match else '',
-                'Company_Name': company_name,
-                'Similarity_Score': similarity,
-                'Similarity_Percentage': similarity * 100,
-                'Status': 'NO_MATCH' if is_no_match else 'MATCH',
-                'Recommendation': 'Rekomendasi dibuka pelatihan baru' if is_no_match else ''
-            })
+            self.append_recommendation((
+                training_idx,
+                training_name,
+                rank,
+                int(job_idx) if not is_no_match else None,
+                job_name if not is_no_match else '',
+                company_name,
+                similarity,
+                similarity * 100,
+                'NO_MATCH' if is_no_match else 'MATCH',
+                'Rekomendasi dibuka pelatihan baru' if is_no_match else '',
+            ))
+        
+        self._flush_log_buf(self.rec_output)
         
         # Table footer
         self.log_message(
@@ -4047,8 +4735,8 @@ class BBPVPMatchingGUI:
         if self.df_pelatihan is None:
             return False
         
-        training_options = [f"{i}: {row['PROGRAM PELATIHAN']}" 
-                    for i, row in self.df_pelatihan.iterrows()]
+        training_options = [f"{i}: {name}" 
+                    for i, name in self.df_pelatihan['PROGRAM PELATIHAN'].items()]
         self.rec_training_combo['values'] = training_options
         if training_options:
             self.rec_training_combo.current(0)
@@ -4089,9 +4777,9 @@ class BBPVPMatchingGUI:
         similarities = self.similarity_matrix[:, job_idx]
         
         # Filter by threshold first, then get top N
-        filtered_indices = [i for i in range(len(similarities)) if similarities[i] >= threshold]
+        top_indices, n_found = self.top_n_indices(similarities, threshold, n_recommendations)
         
-        if not filtered_indices:
+        if n_found == 0:
             self.log_message("=" * 150, self.rec_output)
             self.log_message("NO RECOMMENDATIONS FOUND", self.rec_output)
             self.log_message("=" * 150, self.rec_output)
@@ -4100,10 +4788,6 @@ class BBPVPMatchingGUI:
             self.log_message(f"\nTry lowering the minimum similarity threshold.", self.rec_output)
             return
         
-        # Sort filtered indices by similarity and take top N
-        filtered_indices.sort(key=lambda i: similarities[i], reverse=True)
-        top_indices = filtered_indices[:n_recommendations]
-        
         # Display header
         self.log_message("=" * 150, self.rec_output)
         self.log_message("TRAINING PROGRAM RECOMMENDATIONS - SINGLE JOB", self.rec_output)
@@ -4113,10 +4797,10 @@ class BBPVPMatchingGUI:
         self.log_message(f"🏢 COMPANY: {company_name}", self.rec_output)  
         self.log_message(f"📄 Description: {job_desc[:120]}...", self.rec_output)
         
-        self.log_message(f"\n⚙️  Settings: Top N = {n_recommendations} | Threshold = {threshold:.2f} | Found = {len(filtered_indices)} programs", self.rec_output)
+        self.log_message(f"\n⚙️  Settings: Top N = {n_recommendations} | Threshold = {threshold:.2f} | Found = {n_found} programs", self.rec_output)
         
         # Display as SQL-style table
-        self.log_message(f"\n\n📊 RECOMMENDATION RESULTS (Showing {len(top_indices)} of {len(filtered_indices)} matches):", self.rec_output)
+        self.log_message(f"\n\n📊 RECOMMENDATION RESULTS (Showing {len(top_indices)} of {n_found} matches):", self.rec_output)
         self.log_message("=" * 150, self.rec_output)
         
         # Table header (without Note column)
@@ -4138,11 +4822,15 @@ class BBPVPMatchingGUI:
         )
         
         # Store for export
-        self.all_recommendations = []
+        self.all_recommendations = self.new_recommendation_columns(REC_COLUMNS)
+        
+        program_names = self.df_pelatihan['PROGRAM PELATIHAN'].to_numpy()
+        
+        levels = np.searchsorted(FIXED_LEVEL_BINS, similarities[top_indices], side='right')
         
         # Table rows
         for rank, pel_idx in enumerate(top_indices, 1):
-            program_name = self.df_pelatihan.iloc[pel_idx]['PROGRAM PELATIHAN']
+            program_name = program_names[pel_idx]
             similarity = similarities[pel_idx]
             
             # Determine match level
@@ -4155,44 +4843,30 @@ class BBPVPMatchingGUI:
             else:
                 program_name_display = program_name
                 # Determine match level using fixed thresholds (or use self.match_thresholds if available)
-                if similarity >= 0.80:
-                    match_level = "excellent"
-                    match_emoji = "🟢"
-                elif similarity >= 0.65:
-                    match_level = "very_good"
-                    match_emoji = "🟢"
-                elif similarity >= 0.50:
-                    match_level = "good"
-                    match_emoji = "🟡"
-                elif similarity >= 0.35:
-                    match_level = "fair"
-                    match_emoji = "🟡"
-                else:
-                    match_level = "weak"
-                    match_emoji = "🔴"
+                level = levels[rank - 1]
+                match_level, match_emoji = MATCH_LEVELS[level]
             
             # Truncate names if too long
             job_display = job_name[:41] + ".." if len(job_name) > 43 else job_name
             program_display = program_name_display[:51] + ".." if len(program_name_display) > 53 else program_name_display
             
-            self.log_message(
-                f"│ {job_idx:<4} │ {job_display:<43} │ {program_display:<53} │ {rank:<4} │ {similarity:<11.8f} │ {similarity*100:<8.2f} │ {match_emoji} {match_level:<8} │",
-                self.rec_output
-            )
+            self._log_buf(f"│ {job_idx:<4} │ {job_display:<43} │ {program_display:<53} │ {rank:<4} │ {similarity:<11.8f} │ {similarity*100:<8.2f} │ {match_emoji} {match_level:<8} │")
             
             # Store for export
-            self.all_recommendations.append({
-                'Job_Index': job_idx,
-                'Job_Name': job_name,
-                'Company_Name': company_name,
-                'Rank': rank,
-                'Training_Index': int(pel_idx) if not is_no_match else None,
-                'Training_Program': program_name if not is_no_match else '',
-                'Similarity_Score': similarity,
-                'Similarity_Percentage': similarity * 100,
-                'Status': 'NO_MATCH' if is_no_match else 'MATCH',
-                'Recommendation': 'Rekomendasi dibuka pelatihan baru' if is_no_match else ''
-            })
+            self.append_recommendation((
+                job_idx,
+                job_name,
+                company_name,
+                rank,
+                int(pel_idx) if not is_no_match else None,
+                program_name if not is_no_match else '',
+                similarity,
+                similarity * 100,
+                'NO_MATCH' if is_no_match else 'MATCH',
+                'Rekomendasi dibuka pelatihan baru' if is_no_match else '',
+            ))
+        
+        self._flush_log_buf(self.rec_output)
         
         # Table footer
         self.log_message(
@@ -4228,15 +4902,16 @@ class BBPVPMatchingGUI:
             messagebox.showerror("Error", "Invalid parameters!")
             return
         
+        level_bins = self.checked_level_bins()
+        if level_bins is None:
+            return
+        
         # Display header
         self.log_message("=" * 170, self.rec_output)
         self.log_message("TRAINING PROGRAM RECOMMENDATIONS - ALL JOBS", self.rec_output)
         self.log_message("=" * 170, self.rec_output)
         self.log_message(f"\n📊 Configuration: Top N = {n_recommendations} per job | Threshold = {threshold:.2f} | Jobs = {len(self.df_lowongan)} | Programs = {len(self.df_pelatihan)}", self.rec_output)
         
-        # Store all recommendations for export
-        self.all_recommendations = []
-        
         # SQL-style table header with Company column
         self.log_message("\n" + "=" * 170, self.rec_output)
         self.log_message(
@@ -4256,92 +4931,104 @@ class BBPVPMatchingGUI:
             self.rec_output
         )
         
-        # Process each job
-        for job_idx in range(len(self.df_lowongan)):
-            job_name = self.df_lowongan.iloc[job_idx]['Nama Jabatan (Sumber Perusahaan)']
-            company_name = self.df_lowongan.iloc[job_idx].get('NAMA PERUSAHAAN', '-')
-            similarities = self.similarity_matrix[:, job_idx]
-            
-            # Get top N that meet threshold
-            top_indices = np.argsort(similarities)[::-1]
-            filtered_indices = [idx for idx in top_indices 
-                            if similarities[idx] >= threshold][:n_recommendations]
+        # Scoring and formatting run off the Tk thread on local rows; the results
+        # reach the widgets and all_recommendations only in finish, on the Tk thread
+        def work():
+            rows = []
+            # Stored for export once complete, so Export never sees a half-built run
+            recs = self.new_recommendation_columns(REC_COLUMNS)
             
-            if not filtered_indices:
-                continue
-            
-            for rank, pel_idx in enumerate(filtered_indices, 1):
-                similarity = similarities[pel_idx]
+            try:
+                # Top N training programs of every job in one pass
+                top_idx, top_scores = self.top_n_per_column(self.similarity_matrix, n_recommendations)
+                top_levels = np.searchsorted(level_bins, top_scores, side='right')
                 
-                # NEW: Handle NO_MATCH
-                is_no_match = similarity == 0
+                program_names, job_names, company_names = self.get_name_arrays()
                 
-                if is_no_match:
-                    program_name = ''  # Blank if NO_MATCH
-                    match_level = "NO_MATCH"
-                    match_emoji = "❌"
-                else:
-                    program_name = self.df_pelatihan.iloc[pel_idx]['PROGRAM PELATIHAN']
-                    # Determine match level
-                    if similarity >= self.match_thresholds['excellent']:
-                        match_level = "excellent"
-                        match_emoji = "🟢"
-                    elif similarity >= self.match_thresholds['very_good']:
-                        match_level = "very_good"
-                        match_emoji = "🟢"
-                    elif similarity >= self.match_thresholds['good']:
-                        match_level = "good"
-                        match_emoji = "🟡"
-                    elif similarity >= self.match_thresholds['fair']:
-                        match_level = "fair"
-                        match_emoji = "🟡"
-                    else:
-                        match_level = "weak"
-                        match_emoji = "🔴"
-                
-                # Truncate names if too long
-                company_display = company_name[:36] + ".." if len(company_name) > 38 else company_name
-                job_display = job_name[:31] + ".." if len(job_name) > 33 else job_name
-                program_display = program_name[:46] + ".." if len(program_name) > 48 else program_name
-                
-                self.log_message(
-                    f"│ {job_idx:<4} │ {company_display:<38} │ {job_display:<33} │ {program_display:<48} │ {rank:<4} │ {similarity:<11.8f} │ {match_emoji} {match_level:<8} │",
-                    self.rec_output
-                )
+                # Process each job
+                for job_idx in range(len(self.df_lowongan)):
+                    job_name = job_names[job_idx]
+                    company_name = company_names[job_idx]
+                    similarities = self.similarity_matrix[:, job_idx]
+                    
+                    # Keep the top N that meet threshold
+                    keep = top_scores[:, job_idx] >= threshold
+                    filtered_indices = top_idx[keep, job_idx]
+                    levels = top_levels[keep, job_idx]
+                    
+                    if len(filtered_indices) == 0:
+                        continue
+                    
+                    for rank, pel_idx in enumerate(filtered_indices, 1):
+                        similarity = similarities[pel_idx]
+                        
+                        # NEW: Handle NO_MATCH
+                        is_no_match = similarity == 0
+                        
+                        if is_no_match:
+                            program_name = ''  # Blank if NO_MATCH
+                            match_level = "NO_MATCH"
+                            match_emoji = "❌"
+                        else:
+                            program_name = program_names[pel_idx]
+                            # Determine match level
+                            level = levels[rank - 1]
+                            match_level, match_emoji = MATCH_LEVELS[level]
+                        
+                        # Truncate names if too long
+                        company_display = company_name[:36] + ".." if len(company_name) > 38 else company_name
+                        job_display = job_name[:31] + ".." if len(job_name) > 33 else job_name
+                        program_display = program_name[:46] + ".." if len(program_name) > 48 else program_name
+                        
+                        rows.append(f"│ {job_idx:<4} │ {company_display:<38} │ {job_display:<33} │ {program_display:<48} │ {rank:<4} │ {similarity:<11.8f} │ {match_emoji} {match_level:<8} │")
+                        
+                        # Store for export
+                        self.append_recommendation((
+                            job_idx,
+                            job_name,
+                            company_name,
+                            rank,
+                            int(pel_idx) if not is_no_match else None,
+                            program_name,
+                            similarity,
+                            similarity * 100,
+                            'NO_MATCH' if is_no_match else 'MATCH',
+                            'Rekomendasi dibuka pelatihan baru' if is_no_match else '',
+                        ), recs)
                 
-                # Store for export
-                self.all_recommendations.append({
-                    'Job_Index': job_idx,
-                    'Job_Name': job_name,
-                    'Company_Name': company_name,
-                    'Rank': rank,
-                    'Training_Index': int(pel_idx) if not is_no_match else None,
-                    'Training_Program': program_name,
-                    'Similarity_Score': similarity,
-                    'Similarity_Percentage': similarity * 100,
-                    'Status': 'NO_MATCH' if is_no_match else 'MATCH',
-                    'Recommendation': 'Rekomendasi dibuka pelatihan baru' if is_no_match else ''
-                })
+                self._ui_queue.put((finish, (rows, recs)))
+            except Exception as e:
+                self._ui_queue.put((failed, (e,)))
         
-        # Table footer
-        self.log_message(
-            f"└{'─' * 6}┴{'─' * 40}┴{'─' * 35}┴{'─' * 50}┴{'─' * 6}┴{'─' * 13}┴{'─' * 12}┘",
-            self.rec_output
-        )
-                
-        self.save_recommendations()
-        self.complete_experiment()
-
-        self.log_message("\n" + "=" * 170, self.rec_output)
-        self.log_message("✅ ALL RECOMMENDATIONS COMPLETE", self.rec_output)
-        self.log_message("=" * 170, self.rec_output)
-        self.log_message(f"\nTotal: {len(self.all_recommendations)} recommendations | Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 
-                    self.rec_output)
-        self.log_message(f"💡 Export available via buttons above", self.rec_output)
+        def failed(e):
+            self.log_message(f"\n✗ Error: {str(e)}", self.rec_output)
+            messagebox.showerror("Error", f"Failed to build recommendations:\n{str(e)}")
+        
+        def finish(rows, recs):
+            self.all_recommendations = recs
+            self.save_recommendations(complete=True)
+            
+            if rows:
+                self.rec_output.insert(tk.END, "\n".join(rows) + "\n")
+            
+            # Table footer
+            self.log_message(
+                f"└{'─' * 6}┴{'─' * 40}┴{'─' * 35}┴{'─' * 50}┴{'─' * 6}┴{'─' * 13}┴{'─' * 12}┘",
+                self.rec_output
+            )
+            
+            self.log_message("\n" + "=" * 170, self.rec_output)
+            self.log_message("✅ ALL RECOMMENDATIONS COMPLETE", self.rec_output)
+            self.log_message("=" * 170, self.rec_output)
+            self.log_message(f"\nTotal: {self.recommendation_count()} recommendations | Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 
+                        self.rec_output)
+            self.log_message(f"💡 Export available via buttons above", self.rec_output)
+        
+        threading.Thread(target=work, daemon=True).start()
 
     def export_recommendations_excel(self):
         """Export all recommendations to Excel"""
-        if not hasattr(self, 'all_recommendations') or not self.all_recommendations:
+        if not self.recommendation_count():
             messagebox.showwarning("Warning", 
                                 "No recommendations to export!\n"
                                 "Please generate recommendations for all jobs first.")
@@ -4356,17 +5043,23 @@ class BBPVPMatchingGUI:
         if filename:
             try:
                 df_export = pd.DataFrame(self.all_recommendations)
-                df_export.to_excel(filename, index=False, sheet_name='Recommendations')
+                if XLSXWRITER_AVAILABLE:
+                    # Stream rows to disk instead of holding the sheet in memory
+                    df_export.to_excel(filename, index=False, sheet_name='Recommendations',
+                                       engine='xlsxwriter',
+                                       engine_kwargs={'options': {'constant_memory': True}})
+                else:
+                    df_export.to_excel(filename, index=False, sheet_name='Recommendations')
                 messagebox.showinfo("Success", 
                                 f"Recommendations exported successfully!\n"
                                 f"File: {filename}\n"
-                                f"Total records: {len(self.all_recommendations)}")
+                                f"Total records: {self.recommendation_count()}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to export:\n{str(e)}")
 
     def export_recommendations_csv(self):
         """Export all recommendations to CSV"""
-        if not hasattr(self, 'all_recommendations') or not self.all_recommendations:
+        if not self.recommendation_count():
             messagebox.showwarning("Warning", 
                                 "No recommendations to export!\n"
                                 "Please generate recommendations for all jobs first.")
@@ -4381,11 +5074,17 @@ class BBPVPMatchingGUI:
         if filename:
             try:
                 df_export = pd.DataFrame(self.all_recommendations)
-                df_export.to_csv(filename, index=False, encoding='utf-8-sig')
+                if PYARROW_AVAILABLE and len(df_export) >= MIN_ROWS_FOR_ARROW_CSV:
+                    with open(filename, 'wb') as f:
+                        # Same BOM as utf-8-sig so Excel detects UTF-8
+                        f.write('\ufeff'.encode('utf-8'))
+                        pa_csv.write_csv(pa.Table.from_pandas(df_export, preserve_index=False), f)
+                else:
+                    df_export.to_csv(filename, index=False, encoding='utf-8-sig')
                 messagebox.showinfo("Success", 
                                 f"Recommendations exported successfully!\n"
                                 f"File: {filename}\n"
-                                f"Total records: {len(self.all_recommendations)}")
+                                f"Total records: {self.recommendation_count()}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to export:\n{str(e)}")
 
@@ -4488,44 +5187,53 @@ class BBPVPMatchingGUI:
             print(f"✗ Error creating experiment: {e}")
             return None
 
-    def save_preprocessing_sample(self, dataset_type, record_index, row):
-        """Save preprocessing sample to database"""
-        if not self.current_experiment_id or not self.db_connection:
-            return
-        
-        try:
-            cursor = self.db_connection.cursor()
-            
-            record_name = row['PROGRAM PELATIHAN'] if dataset_type == 'training' else row['Nama Jabatan (Sumber Perusahaan)']
-            
-            query = """
-            INSERT INTO preprocessing_samples 
-            (experiment_id, dataset_type, record_index, record_name, 
-            original_text, normalized_text, stopwords_removed, 
-            tokenized, stemmed_text, token_count)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            token_count = int(row.get('token_count', 0)) if pd.notna(row.get('token_count', 0)) else 0
-            
-            values = (
-                self.current_experiment_id,
-                dataset_type,
-                int(record_index),
-                record_name,
-                row.get('text_features', ''),
-                row.get('normalized', ''),
-                row.get('no_stopwords', ''),
-                json.dumps(row.get('tokens', [])),
-                row.get('stemmed', ''),
-                token_count
-            )
-            
-            cursor.execute(query, values)
-            self.db_connection.commit()
-            cursor.close()
-        except Error as e:
-            print(f"✗ Error saving preprocessing sample: {e}")
+    def build_preprocessing_sample_row(self, dataset_type, record_index, record_name,
+                                       text_features, normalized, no_stopwords,
+                                       tokens, stemmed, token_count):
+        """Build one preprocessing_samples row from a record's stage outputs"""
+        return (
+            self.current_experiment_id,
+            dataset_type,
+            int(record_index),
+            record_name,
+            text_features,
+            normalized,
+            no_stopwords,
+            json.dumps(list(tokens)),
+            stemmed,
+            int(token_count) if pd.notna(token_count) else 0
+        )
+
+    def save_preprocessing_samples_batch(self, rows):
+        """Queue preprocessing samples for saving on the DB worker thread; safe to
+        call from the preprocessing thread, which never touches db_connection"""
+        if not self.current_experiment_id or not self.db_connection or not rows:
+            return None
+        return self.submit_db_task("saving preprocessing samples",
+                                   self._save_preprocessing_samples, self._pool, rows)
+
+    def _save_preprocessing_samples(self, pool, rows):
+        """Save preprocessing samples in one executemany + commit"""
+        with pool.get_connection() as conn:
+            try:
+                cursor = conn.cursor()
+                
+                query = """
+                INSERT INTO preprocessing_samples 
+                (experiment_id, dataset_type, record_index, record_name, 
+                original_text, normalized_text, stopwords_removed, 
+                tokenized, stemmed_text, token_count)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """
+                
+                cursor.executemany(query, rows)
+                conn.commit()
+                cursor.close()
+                return f"Saved {len(rows)} preprocessing samples to database"
+            except Exception:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
 
     def save_tfidf_calculation(self, pel_idx, low_idx):
         """Save TF-IDF calculation to database"""
@@ -4557,8 +5265,8 @@ class BBPVPMatchingGUI:
                 json.dumps(self.tf_d1),
                 json.dumps(self.tf_d2),
                 json.dumps(self.idf_dict),
-                json.dumps(self.tfidf_d1),
-                json.dumps(self.tfidf_d2),
+                json.dumps(dict(zip(self.current_all_terms, self.tfidf_d1.tolist()))),
+                json.dumps(dict(zip(self.current_all_terms, self.tfidf_d2.tolist()))),
                 float(self.current_similarity)
             )         
 
@@ -4569,13 +5277,52 @@ class BBPVPMatchingGUI:
         except Error as e:
             print(f"✗ Error saving TF-IDF: {e}")
 
+    def submit_db_task(self, action, func, *args):
+        """Run func(*args) on the DB worker thread and report its outcome in the
+        Database tab; action names the task in the error message"""
+        future = self._db_executor.submit(func, *args)
+        future.add_done_callback(lambda f: self._report_db_task(f, action))
+        return future
+
+    def _report_db_task(self, future, action):
+        """Done-callback of a DB task: print the result and queue it for db_log_output"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        message = f"✗ Error {action}: {error}" if error is not None else f"✓ {future.result()}"
+        print(message)
+        self._ui_queue.put((self._write_db_log, (message,)))
+
+    def _write_db_log(self, message):
+        """Append a DB task result to the Database tab, if it has been built"""
+        if hasattr(self, 'db_log_output'):
+            self._write_log(message, self.db_log_output)
+
     def save_similarity_matrix(self):
-        """Save full similarity matrix to database"""
+        """Queue the full similarity matrix for saving on the DB worker thread"""
         if not self.current_experiment_id or not self.db_connection:
-            return
+            return None
         
+        program_names = self.df_pelatihan['PROGRAM PELATIHAN'].to_numpy()
+        job_names = self.df_lowongan['Nama Jabatan (Sumber Perusahaan)'].to_numpy()
+        return self.submit_db_task("saving similarity matrix", self._save_similarity_matrix,
+                                   self._pool, self.similarity_matrix, program_names,
+                                   job_names, self.current_experiment_id)
+
+    def _save_similarity_matrix(self, pool, similarity_matrix, program_names, job_names,
+                                experiment_id):
+        """Save full similarity matrix to database"""
+        with pool.get_connection() as conn:
+            return self._insert_similarity_matrix(conn, similarity_matrix, program_names,
+                                                  job_names, experiment_id)
+
+    def _insert_similarity_matrix(self, conn, similarity_matrix, program_names, job_names,
+                                  experiment_id):
+        """Insert every similarity score on the given connection in one commit"""
         try:
-            cursor = self.db_connection.cursor()
+            # Plain cursor: executemany rewrites each batch into one multi-row
+            # INSERT, where a prepared cursor would send one execute per row
+            cursor = conn.cursor()
             
             query = """
             INSERT INTO similarity_matrix 
@@ -4583,91 +5330,127 @@ class BBPVPMatchingGUI:
             VALUES (%s, %s, %s, %s, %s, %s)
             """
             
-            batch_data = []
-            for job_idx in range(len(self.df_lowongan)):
-                job_name = self.df_lowongan.iloc[job_idx]['Nama Jabatan (Sumber Perusahaan)']
-                for pel_idx in range(len(self.df_pelatihan)):
-                    training_name = self.df_pelatihan.iloc[pel_idx]['PROGRAM PELATIHAN']
-                    similarity = float(self.similarity_matrix[pel_idx, job_idx])
-                    
-                batch_data.append((
-                    self.current_experiment_id,
-                    int(pel_idx),
-                    training_name,
-                    int(job_idx),
-                    job_name,
-                    float(similarity)
-                ))
+            # One row per (training, job) cell, flattened in matrix order
+            pel_ix, job_ix = np.indices(similarity_matrix.shape)
+            flat_pel = pel_ix.ravel()
+            flat_job = job_ix.ravel()
+            flat_sim = similarity_matrix.ravel()
             
-            cursor.executemany(query, batch_data)
-            self.db_connection.commit()
+            for start in range(0, flat_sim.size, DB_BATCH_SIZE):
+                pel = flat_pel[start:start + DB_BATCH_SIZE]
+                job = flat_job[start:start + DB_BATCH_SIZE]
+                cursor.executemany(query, list(zip(
+                    itertools.repeat(experiment_id),
+                    pel.tolist(),
+                    program_names[pel].tolist(),
+                    job.tolist(),
+                    job_names[job].tolist(),
+                    flat_sim[start:start + DB_BATCH_SIZE].tolist()
+                )))
+            conn.commit()
             cursor.close()
-            print(f"✓ Saved {len(batch_data)} similarity scores to database")
-        except Error as e:
-            print(f"✗ Error saving similarity matrix: {e}")
+            return f"Saved {flat_sim.size} similarity scores to database"
+        except Exception:
+            # Roll back on any failure, so the pooled connection goes back clean
+            if conn.in_transaction:
+                conn.rollback()
+            raise
 
-    def save_recommendations(self):
-        """Save recommendations to database"""
+    def get_recommendation_insert_sql(self, n_rows):
+        """Multi-row recommendations INSERT for n_rows rows; the full-chunk
+        statement is built once, the shorter final chunk on demand"""
+        if n_rows == MULTI_INSERT_ROWS and self._rec_insert_sql is not None:
+            return self._rec_insert_sql
+        query = self._INSERT_SQL + ",".join([self._INSERT_ROW_SQL] * n_rows)
+        if n_rows == MULTI_INSERT_ROWS:
+            self._rec_insert_sql = query
+        return query
+
+    def save_recommendations(self, complete=False):
+        """Queue the current recommendations for saving on the DB worker thread;
+        with complete=True the experiment is marked completed in the same commit"""
         if not self.current_experiment_id or not self.db_connection:
-            return
+            return None
         
+        # Snapshot the saved columns so the next run can refill all_recommendations
+        # while this one saves
+        recs = tuple(list(values) for values in _REC_GET(self.all_recommendations))
+        return self.submit_db_task("saving recommendations", self._save_recommendations,
+                                   self._pool, recs, self.current_experiment_id,
+                                   self.get_level_bins(), complete)
+
+    def _save_recommendations(self, pool, recs, experiment_id, level_bins, complete=False):
+        """Save recommendations to database"""
+        # Own pooled connection, so saves never share a socket with the UI thread
+        with pool.get_connection() as conn:
+            return self._insert_recommendations(conn, recs, experiment_id, level_bins, complete)
+
+    def _insert_recommendations(self, conn, recs, experiment_id, level_bins, complete):
+        """Insert recommendations on the given connection in one transaction"""
         try:
-            cursor = self.db_connection.cursor()
+            cursor = conn.cursor()
             
-            query = """
-            INSERT INTO recommendations 
-            (experiment_id, job_index, job_name, training_index, training_name,
-            rank_position, similarity_score, similarity_percentage, match_level)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
+            (job_indices, job_names, training_indices, training_names,
+             ranks, scores, percentages, statuses) = recs
             
-            batch_data = []
-            for rec in self.all_recommendations:
-                # Determine match level
-                similarity = rec['Similarity_Score']
-                if similarity >= self.match_thresholds['excellent']:
-                    match_level = 'excellent'
-                elif similarity >= self.match_thresholds['very_good']:
-                    match_level = 'very_good'
-                elif similarity >= self.match_thresholds['good']:
-                    match_level = 'good'
-                elif similarity >= self.match_thresholds['fair']:
-                    match_level = 'fair'
-                else:
-                    match_level = 'weak'
-                
-                batch_data.append((
-                    self.current_experiment_id,
-                    int(rec['Job_Index']),
-                    rec['Job_Name'],
-                    int(rec['Training_Index']),
-                    rec['Training_Program'],
-                    int(rec['Rank']),
-                    float(rec['Similarity_Score']),
-                    float(rec['Similarity_Percentage']),
-                    match_level
-                ))
+            # NO_MATCH rows have no job or training index, and both columns are NOT NULL
+            keep = np.asarray(statuses, dtype=object) != 'NO_MATCH'
+            skipped = int(np.count_nonzero(~keep))
+            if skipped:
+                (job_indices, job_names, training_indices, training_names,
+                 ranks, scores, percentages) = (
+                    np.asarray(values, dtype=object)[keep].tolist()
+                    for values in (job_indices, job_names, training_indices, training_names,
+                                   ranks, scores, percentages))
             
-            cursor.executemany(query, batch_data)
-            self.db_connection.commit()
-            cursor.close()
-            print(f"✓ Saved {len(batch_data)} recommendations to database")
-        except Error as e:
-            print(f"✗ Error saving recommendations: {e}")
-
-    def complete_experiment(self):
-        """Mark experiment as completed"""
-        if not self.current_experiment_id or not self.db_connection:
-            return
-        
-        try:
-            cursor = self.db_connection.cursor()
-            cursor.callproc('sp_complete_experiment', [self.current_experiment_id])
-            self.db_connection.commit()
+            # Determine every match level in one vectorized pass
+            similarities = np.asarray(scores, dtype=np.float64)
+            level_idx = np.searchsorted(level_bins, similarities, side='right')
+            match_levels = np.asarray(LEVEL_NAMES, dtype=object)[level_idx]
+            
+            # Coerce whole columns at once; tolist() yields native ints/floats.
+            # Row tuples are produced lazily, one chunk at a time
+            rows = zip(
+                itertools.repeat(experiment_id),
+                np.asarray(job_indices, dtype=np.int64).tolist(),
+                job_names,
+                np.asarray(training_indices, dtype=np.int64).tolist(),
+                training_names,
+                np.asarray(ranks, dtype=np.int64).tolist(),
+                similarities.tolist(),
+                np.asarray(percentages, dtype=np.float64).tolist(),
+                match_levels.tolist()
+            )
+            
+            # All chunks in one explicit transaction: one commit, or nothing on error
+            if conn.in_transaction:
+                conn.commit()
+            conn.start_transaction(isolation_level='READ COMMITTED')
+            
+            # Multi-row INSERT statements, chunked to stay under max_allowed_packet
+            saved = 0
+            while True:
+                chunk = list(itertools.islice(rows, MULTI_INSERT_ROWS))
+                if not chunk:
+                    break
+                cursor.execute(self.get_recommendation_insert_sql(len(chunk)),
+                               list(itertools.chain.from_iterable(chunk)))
+                saved += len(chunk)
+            if complete:
+                cursor.execute(self._COMPLETE_EXPERIMENT_SQL, ('completed', experiment_id))
+            conn.commit()
             cursor.close()
-            print("✓ Experiment marked as completed")
-        except Error as e:
-            print(f"✗ Error completing experiment: {e}")
+            message = f"Saved {saved} recommendations to database"
+            if skipped:
+                message += f" ({skipped} NO_MATCH rows not stored)"
+            if complete:
+                message += "; experiment marked as completed"
+            return message
+        except Exception:
+            # Roll back on any failure, so the pooled connection goes back clean
+            if conn.in_transaction:
+                conn.rollback()
+            raise
 
     # ============================================================================
     # JACCARD SIMILARITY FUNCTIONS
@@ -4728,17 +5511,23 @@ class BBPVPMatchingGUI:
             return None
         
         n_training = len(self.df_pelatihan)
-        n_jobs = len(self.df_lowongan)
-        
-        jaccard_matrix = np.zeros((n_training, n_jobs))
-        
-        for i in range(n_training):
-            tokens1 = self.df_pelatihan.iloc[i]['stemmed_tokens']
-            for j in range(n_jobs):
-                tokens2 = self.df_lowongan.iloc[j]['stemmed_tokens']
-                result = self.calculate_jaccard_similarity(tokens1, tokens2)
-                jaccard_matrix[i, j] = result['jaccard_similarity']
         
+        # Binary document-term matrix over the shared vocabulary: one sparse
+        # product gives |A ∩ B| for every pair, row sums give |A| and |B|
+        binary = MultiLabelBinarizer(sparse_output=True).fit_transform(
+            self.df_pelatihan['stemmed_tokens'].tolist() + self.df_lowongan['stemmed_tokens'].tolist()
+        ).tocsr()
+        training_bin = binary[:n_training]
+        job_bin = binary[n_training:]
+        
+        intersection = (training_bin @ job_bin.T).toarray()
+        training_sizes = np.asarray(training_bin.sum(axis=1)).ravel()
+        job_sizes = np.asarray(job_bin.sum(axis=1)).ravel()
+        union = training_sizes[:, None] + job_sizes[None, :] - intersection
+        
+        # Two empty documents score 0, as in calculate_jaccard_similarity
+        jaccard_matrix = np.zeros(union.shape)
+        np.divide(intersection, union, out=jaccard_matrix, where=union > 0)
         return jaccard_matrix
 
     # ============================================================================
@@ -4923,15 +5712,15 @@ class BBPVPMatchingGUI:
             return
         
         # Load pelatihan options
-        pelatihan_options = [f"{i}: {row['PROGRAM PELATIHAN']}" 
-                            for i, row in self.df_pelatihan.iterrows()]
+        pel_names = self.df_pelatihan['PROGRAM PELATIHAN'].tolist()
+        pelatihan_options = [f"{i}: {name}" for i, name in enumerate(pel_names)]
         self.jaccard_pelatihan_combo['values'] = pelatihan_options
         if pelatihan_options:
             self.jaccard_pelatihan_combo.current(0)
         
         # Load lowongan options
-        lowongan_options = [f"{i}: {row['Nama Jabatan (Sumber Perusahaan)']}" 
-                        for i, row in self.df_lowongan.iterrows()]
+        lowongan_options = [f"{i}: {name}" 
+                        for i, name in self.df_lowongan['Nama Jabatan (Sumber Perusahaan)'].items()]
         self.jaccard_lowongan_combo['values'] = lowongan_options
         if lowongan_options:
             self.jaccard_lowongan_combo.current(0)
@@ -5098,7 +5887,7 @@ class BBPVPMatchingGUI:
             use_smoothing = False
             print(f"🎯 LAPORAN CASE: Using non-smoothed IDF formula for idx {training_idx} vs {job_idx}")
         
-        all_terms = sorted(set(tokens1 + tokens2))
+        all_terms = sorted(set(tokens1).union(tokens2))
         
         # Calculate TF for D1
         tf_d1 = {}
@@ -5211,16 +6000,16 @@ class BBPVPMatchingGUI:
         
         # Load training options
         if not self.comparison_training_combo['values']:
-            training_options = [f"{i}: {row['PROGRAM PELATIHAN']}" 
-                                for i, row in self.df_pelatihan.iterrows()]
+            training_options = [f"{i}: {name}" 
+                                for i, name in self.df_pelatihan['PROGRAM PELATIHAN'].items()]
             self.comparison_training_combo['values'] = training_options
             if training_options:
                 self.comparison_training_combo.current(0)
         
         # Load job options
         if not self.comparison_job_combo['values']:
-            job_options = [f"{i}: {row['Nama Jabatan (Sumber Perusahaan)']}" 
-                        for i, row in self.df_lowongan.iterrows()]
+            job_options = [f"{i}: {name}" 
+                        for i, name in self.df_lowongan['Nama Jabatan (Sumber Perusahaan)'].items()]
             self.comparison_job_combo['values'] = job_options
             if job_options:
                 self.comparison_job_combo.current(0)
@@ -5431,13 +6220,17 @@ def main():
     app = BBPVPMatchingGUI(root)
     
     def on_closing():
-        if app.db_connection and app.db_connection.is_connected():
-            app.db_connection.close()
-            print("✓ Database connection closed")
+        # Let queued saves finish before the connections go away
+        app._db_executor.shutdown(wait=True)
+        if app._pool is not None:
+            app.close_database()
+            print("✓ Database connections closed")
         root.destroy()
     
     root.protocol("WM_DELETE_WINDOW", on_closing)
     root.mainloop()
 
 if __name__ == "__main__":
+    # The stemming pool spawns workers; in a frozen exe they must not rerun the GUI
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -113,6 +113,11 @@ CREATE TABLE IF NOT EXISTS similarity_matrix (
 -- ============================================================================
 -- TABLE 5: recommendations
 -- Purpose: Store final recommendations for each job position
+-- Note: InnoDB ignores DISABLE KEYS, and ALTER TABLE would commit the save
+-- transaction. For large saves, let the change buffer absorb the secondary
+-- index writes instead (my.cnf):
+--   innodb_change_buffering = all
+--   innodb_change_buffer_max_size = 50
 -- ============================================================================
 CREATE TABLE IF NOT EXISTS recommendations (
     recommendation_id INT AUTO_INCREMENT PRIMARY KEY,